@@ -1,6 +1,7 @@
 """Functions and classes to do with numba compilation"""
 
-from typing import get_type_hints
+from typing import get_type_hints, Callable
+import functools
 import numpy as np
 from .options import USE_NUMBA
 
@@ -45,6 +46,8 @@ if USE_NUMBA:
 
     TypedDict = typed_dict_constructor
 
+    optional_prange = numba.prange
+
     def optional_ir_function(function, sig):
         """Optional custom IR function to be used in place of `function`"""
 
@@ -100,6 +103,8 @@ else:
     TypedListType = list
     TypedDict = typed_dict_constructor
 
+    optional_prange = range
+
     def convert_to_numba(input_type):
         """Convert to numba type"""
         return input_type
@@ -173,3 +178,26 @@ def optional_njit(signature_or_function=None, locals=None, **options):
         return func
 
     return wrap
+
+
+CONST_FUNCTION_REGISTRY = {}
+
+
+def memoized_const_function(owner, const_function: Callable) -> Callable:
+    """Wrap a const function compiler so that identical (owner, constant, compile kwargs)
+    specializations share a single compiled function across the process"""
+
+    @functools.wraps(const_function)
+    def wrapper(constant, **kwargs):
+        key = (owner, const_function.__name__, constant, tuple(sorted(kwargs.items())))
+        try:
+            compiled_function = CONST_FUNCTION_REGISTRY.get(key)
+        except TypeError:
+            # unhashable compile kwargs (i.e. locals) are compiled without memoization
+            return const_function(constant, **kwargs)
+        if compiled_function is None:
+            compiled_function = const_function(constant, **kwargs)
+            CONST_FUNCTION_REGISTRY[key] = compiled_function
+        return compiled_function
+
+    return wrapper
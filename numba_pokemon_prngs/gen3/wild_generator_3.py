@@ -78,6 +78,7 @@ class WildGenerator3:
         rng.jump(initial_advances + delay)
         for advance in range(initial_advances, initial_advances + max_advances):
             go.re_init(rng.seed)
+            rng.next()
 
             # RSE uses main rng to check for rock smash encounters
             if rse and self.encounter == Encounter.ROCK_SMASH and rand_2880(go) >= rate:
@@ -144,6 +145,4 @@ class WildGenerator3:
 
             states.append(state)
 
-            rng.next()
-
         return states
@@ -0,0 +1,197 @@
+"""GF(2) linear algebra on 128-bit states packed as two uint64 words
+
+A 128x128 matrix is stored as its 128 columns, column i being the packed image
+of the state with only bit i set (bit i of word i >> 6)"""
+
+from __future__ import annotations
+from typing import Callable, Iterator, Optional
+import numpy as np
+from .compilation import optional_njit
+
+BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+
+
+def basis_states() -> np.ndarray:
+    """The 128 packed states with a single bit set"""
+    states = np.zeros((128, 2), dtype=np.uint64)
+    states[np.arange(128), np.arange(128) >> 6] = np.uint64(1) << (
+        np.arange(128, dtype=np.uint64) & np.uint64(63)
+    )
+    return states
+
+
+def multiply_matrices(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Compute left @ right over GF(2) by applying left to every column of right"""
+    # bits[j, i] -> bit i of column j of right
+    bits = (right[:, :, None] >> BIT_SHIFTS) & np.uint64(1)
+    bits = bits.reshape(128, 128).astype(bool)
+    return np.bitwise_xor.reduce(
+        np.where(bits[:, :, None], left[None, :, :], np.uint64(0)), axis=1
+    )
+
+
+def matrix_powers(step: np.ndarray, count: int) -> np.ndarray:
+    """Compute step^(2^k) for k in [0, count) as a (count, 128, 2) array"""
+    powers = np.empty((count, 128, 2), dtype=np.uint64)
+    powers[0] = step
+    for k in range(1, count):
+        powers[k] = multiply_matrices(powers[k - 1], powers[k - 1])
+    powers.flags.writeable = False
+    return powers
+
+
+def basis_evolutions(
+    advances: np.ndarray,
+    step_states: Callable[[np.ndarray], np.ndarray],
+    jump_matrices: np.ndarray,
+    jump_threshold: int,
+) -> Iterator[np.ndarray]:
+    """Yield the packed images of the 128 basis states after each of the sorted
+    advances, stepping with step_states or jumping with jump_matrices = step^(2^k)
+    for gaps of at least jump_threshold
+
+    Bit j of a linear output of a state is that output of the image of basis state j"""
+    states = basis_states()
+    position = 0
+    for adv in advances:
+        gap = int(adv) - position
+        if gap >= jump_threshold:
+            for k in range(64):
+                if (gap >> k) & 1:
+                    states = multiply_matrices(jump_matrices[k], states)
+        else:
+            for _ in range(gap):
+                step_states(states)
+        position = int(adv)
+        yield states
+
+
+@optional_njit()
+def apply_matrix_words(
+    matrix: np.ndarray, word_0: np.uint64, word_1: np.uint64
+) -> tuple[np.uint64, np.uint64]:
+    """Multiply the packed state (word_0, word_1) by matrix"""
+    result_0 = np.uint64(0)
+    result_1 = np.uint64(0)
+    # multiplying by each bit instead of branching lets the loops vectorize
+    for i in range(64):
+        bit = (word_0 >> np.uint64(i)) & np.uint64(1)
+        result_0 ^= matrix[i, 0] * bit
+        result_1 ^= matrix[i, 1] * bit
+    for i in range(64):
+        bit = (word_1 >> np.uint64(i)) & np.uint64(1)
+        result_0 ^= matrix[i + 64, 0] * bit
+        result_1 ^= matrix[i + 64, 1] * bit
+    return result_0, result_1
+
+
+@optional_njit()
+def apply_matrix(matrix: np.ndarray, state: np.ndarray) -> None:
+    """Multiply a packed state by matrix in place"""
+    state[0], state[1] = apply_matrix_words(matrix, state[0], state[1])
+
+
+@optional_njit()
+def apply_matrix_powers(powers: np.ndarray, state: np.ndarray, adv: np.uint64) -> None:
+    """Multiply a packed state by step^adv in place using precomputed matrix_powers"""
+    adv = np.uint64(adv)
+    for k in range(powers.shape[0]):
+        if (adv >> np.uint64(k)) & np.uint64(1):
+            apply_matrix(powers[k], state)
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """Pack 128 per-bit values into a packed state"""
+    bits = bits.astype(np.uint64).reshape(2, 64)
+    return np.bitwise_or.reduce(bits << BIT_SHIFTS, axis=1)
+
+
+def observed_bits(
+    bits: np.ndarray, advances: Optional[np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Validate observed output bits and the sorted advances they were observed at
+    (default consecutive) as uint8 and uint64 arrays"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    if advances is None:
+        advances = np.arange(bits.shape[0], dtype=np.uint64)
+    advances = np.asarray(advances, dtype=np.uint64)
+    assert bits.shape == advances.shape, "Every bit needs an advance"
+    assert np.all(advances[1:] >= advances[:-1]), "Advances must be sorted"
+    return bits, advances
+
+
+@optional_njit()
+def solve_rows(
+    rows: np.ndarray, bits: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Solve rows @ state = bits over GF(2) via Gaussian elimination on packed rows
+
+    Returns one solution with every free bit cleared, a (128 - rank, 2) basis
+    of the nullspace of rows and whether the system is consistent"""
+    augmented = np.empty((rows.shape[0], 3), dtype=np.uint64)
+    augmented[:, :2] = rows
+    for i in range(bits.shape[0]):
+        augmented[i, 2] = np.uint64(bits[i] & 1)
+    pivots = np.empty(128, dtype=np.int64)
+    is_pivot = np.zeros(128, dtype=np.bool_)
+    rank = 0
+    for column in range(128):
+        word = column >> 6
+        mask = np.uint64(1) << np.uint64(column & 63)
+        pivot = rank
+        while pivot < augmented.shape[0] and not augmented[pivot, word] & mask:
+            pivot += 1
+        if pivot == augmented.shape[0]:
+            continue
+        for i in range(3):
+            augmented[rank, i], augmented[pivot, i] = (
+                augmented[pivot, i],
+                augmented[rank, i],
+            )
+        for row in range(augmented.shape[0]):
+            if row != rank and augmented[row, word] & mask:
+                for i in range(3):
+                    augmented[row, i] ^= augmented[rank, i]
+        pivots[rank] = column
+        is_pivot[column] = True
+        rank += 1
+    consistent = True
+    for row in range(rank, augmented.shape[0]):
+        if augmented[row, 2]:
+            consistent = False
+    solution = np.zeros(2, dtype=np.uint64)
+    for row in range(rank):
+        if augmented[row, 2]:
+            solution[pivots[row] >> 6] |= np.uint64(1) << np.uint64(pivots[row] & 63)
+    # setting one free bit forces the pivot bits of the rows it appears in
+    nullspace = np.zeros((128 - rank, 2), dtype=np.uint64)
+    i = 0
+    for column in range(128):
+        if is_pivot[column]:
+            continue
+        word = column >> 6
+        mask = np.uint64(1) << np.uint64(column & 63)
+        nullspace[i, word] |= mask
+        for row in range(rank):
+            if augmented[row, word] & mask:
+                nullspace[i, pivots[row] >> 6] |= np.uint64(1) << np.uint64(
+                    pivots[row] & 63
+                )
+        i += 1
+    return solution, nullspace, consistent
+
+
+@optional_njit()
+def enumerate_solutions(solution: np.ndarray, nullspace: np.ndarray) -> np.ndarray:
+    """Every solution + span(nullspace) as a (2^len(nullspace), 2) array
+    in gray code order"""
+    states = np.empty((1 << nullspace.shape[0], 2), dtype=np.uint64)
+    states[0] = solution
+    for i in range(1, states.shape[0]):
+        # the gray code of i differs from that of i - 1 in its lowest set bit
+        lowest_bit = 0
+        while not (i >> lowest_bit) & 1:
+            lowest_bit += 1
+        states[i, 0] = states[i - 1, 0] ^ nullspace[lowest_bit, 0]
+        states[i, 1] = states[i - 1, 1] ^ nullspace[lowest_bit, 1]
+    return states
@@ -105,3 +105,11 @@ class BWRNGR(LCRNG64):
 
 
 # pylint: enable=abstract-method
+
+# pylint: disable=wrong-import-position,cyclic-import
+from .seed_recovery import (
+    build_iv_seed_recovery,
+    get_iv_seed_recovery,
+    recover_iv_seeds,
+)
+from .sweep import sweep_chunks, sweep_lcrng32
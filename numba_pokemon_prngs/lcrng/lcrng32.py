@@ -4,7 +4,12 @@ from __future__ import annotations
 from typing import Type, Callable
 import enum
 import numpy as np
-from ..compilation import optional_jitclass, optional_njit
+from ..compilation import (
+    optional_jitclass,
+    optional_njit,
+    optional_prange,
+    memoized_const_function,
+)
 from ..compatability import mod_inv
 
 
@@ -67,6 +72,24 @@ class LCRNG32:
         """
         raise NotImplementedError()
 
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] full 32-bit random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_u16(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 16-bit random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_u16()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint16) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
     @staticmethod
     def const_jump(adv: np.uint32, **kwargs) -> Callable[[LCRNG32]]:
         """Compile @njit jump function with a const adv"""
@@ -77,6 +100,47 @@ class LCRNG32:
         """Compile @njit rand function with a const maximum"""
         raise NotImplementedError()
 
+    @staticmethod
+    def jump_constants(adv: np.uint32) -> tuple[np.uint32, np.uint32]:
+        """Compute the combined (add, mult) of a jump of adv"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def next_array(seeds: np.ndarray) -> np.ndarray:
+        """Advance every seed of a uint32 array by one in place and return it"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def next_u16_array(seeds: np.ndarray) -> np.ndarray:
+        """Advance every seed of a uint32 array in place and return the 16-bit rands"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def next_rand_array(seeds: np.ndarray, maximum: np.uint16) -> np.ndarray:
+        """Advance every seed of a uint32 array in place and return the [0, maximum) rands"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def jump_array(seeds: np.ndarray, adv: np.uint32) -> np.ndarray:
+        """Jump ahead every seed of a uint32 array by adv in place and return it"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def jump_array_lanes(seeds: np.ndarray, advs: np.ndarray) -> np.ndarray:
+        """Jump ahead each seed of a uint32 array by the matching advs value
+        in place and return it"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def distance(seed_from: np.uint32, seed_to: np.uint32) -> np.uint32:
+        """Compute the amount of advances needed to go from seed_from to seed_to"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def distance_array(seed_from: np.uint32, seeds_to: np.ndarray) -> np.ndarray:
+        """Compute the amount of advances needed to go from seed_from to each of seeds_to"""
+        raise NotImplementedError()
+
 
 def lcrng32_init(
     *,
@@ -106,6 +170,48 @@ def lcrng32_init(
         )
     jump_table = tuple(jump_table)
 
+    @optional_njit()
+    def jump_constants(adv: np.uint32) -> tuple[np.uint32, np.uint32]:
+        """Compute the combined (add, mult) of a jump of adv"""
+        i = 0
+        jump_mult = np.uint32(1)
+        jump_add = np.uint32(0)
+        while adv:
+            if adv & 1:
+                add_val, mult_val = jump_table[i]
+                jump_mult = np.uint32(jump_mult * mult_val)
+                jump_add = np.uint32(jump_add * mult_val + add_val)
+            adv >>= 1
+            i += 1
+        return jump_add, jump_mult
+
+    @optional_njit()
+    def distance(seed_from: np.uint32, seed_to: np.uint32) -> np.uint32:
+        # advancing by 2**i leaves the low i bits unchanged and always flips bit i,
+        # so the distance can be built up one bit at a time
+        seed_from = np.uint32(seed_from)
+        seed_to = np.uint32(seed_to)
+        result = np.uint32(0)
+        mask = np.uint32(1)
+        for i in range(32):
+            if seed_from == seed_to:
+                break
+            if (seed_from ^ seed_to) & mask:
+                add_val, mult_val = jump_table[i]
+                seed_from = np.uint32(
+                    seed_from * np.uint32(mult_val) + np.uint32(add_val)
+                )
+                result |= mask
+            mask = np.uint32(mask << np.uint32(1))
+        return result
+
+    @optional_njit(parallel=True)
+    def distance_array(seed_from: np.uint32, seeds_to: np.ndarray) -> np.ndarray:
+        distances = np.empty(seeds_to.shape[0], dtype=np.uint32)
+        for i in optional_prange(seeds_to.shape[0]):
+            distances[i] = distance(seed_from, seeds_to[i])
+        return distances
+
     def wrap(lcrng_class: Type[LCRNG32]) -> Type[LCRNG32]:
         def next_(self: LCRNG32) -> np.uint32:
             self.seed = np.uint32(
@@ -126,16 +232,7 @@ def lcrng32_init(
             return np.uint32(self.seed)
 
         def const_jump(adv: np.uint32, **kwargs) -> Callable[[LCRNG32]]:
-            i = 0
-            mult = np.uint32(1)
-            add = np.uint32(0)
-            while adv:
-                add_val, mult_val = jump_table[i]
-                if adv & 1:
-                    mult *= mult_val
-                    add = add * mult_val + add_val
-                adv >>= 1
-                i += 1
+            add, mult = jump_constants(adv)
 
             @optional_njit(**kwargs)
             def jump_func(self: LCRNG32):
@@ -146,6 +243,41 @@ def lcrng32_init(
 
             return jump_func
 
+        @optional_njit(parallel=True)
+        def next_array(seeds: np.ndarray) -> np.ndarray:
+            for i in optional_prange(seeds.shape[0]):
+                seeds[i] = np.uint32(
+                    np.uint32(seeds[i]) * np.uint32(mult) + np.uint32(add)
+                )
+            return seeds
+
+        @optional_njit(parallel=True)
+        def next_u16_array(seeds: np.ndarray) -> np.ndarray:
+            rands = np.empty(seeds.shape[0], dtype=np.uint16)
+            for i in optional_prange(seeds.shape[0]):
+                seed = np.uint32(np.uint32(seeds[i]) * np.uint32(mult) + np.uint32(add))
+                seeds[i] = seed
+                rands[i] = np.uint16(seed >> np.uint32(16))
+            return rands
+
+        @optional_njit(parallel=True)
+        def jump_array(seeds: np.ndarray, adv: np.uint32) -> np.ndarray:
+            jump_add, jump_mult = jump_constants(adv)
+            for i in optional_prange(seeds.shape[0]):
+                seeds[i] = np.uint32(
+                    np.uint32(seeds[i]) * np.uint32(jump_mult) + np.uint32(jump_add)
+                )
+            return seeds
+
+        @optional_njit(parallel=True)
+        def jump_array_lanes(seeds: np.ndarray, advs: np.ndarray) -> np.ndarray:
+            for i in optional_prange(seeds.shape[0]):
+                jump_add, jump_mult = jump_constants(advs[i])
+                seeds[i] = np.uint32(
+                    np.uint32(seeds[i]) * np.uint32(jump_mult) + np.uint32(jump_add)
+                )
+            return seeds
+
         if distribution == LCRNG32RandomDistribution.MODULO:
 
             def next_rand(self: LCRNG32, maximum: np.uint16) -> np.uint16:
@@ -160,6 +292,13 @@ def lcrng32_init(
 
                 return rand_func
 
+            @optional_njit(parallel=True)
+            def next_rand_array(seeds: np.ndarray, maximum: np.uint16) -> np.ndarray:
+                rands = next_u16_array(seeds)
+                for i in optional_prange(rands.shape[0]):
+                    rands[i] = np.uint16(rands[i]) % np.uint16(maximum)
+                return rands
+
         elif distribution == LCRNG32RandomDistribution.RECIPROCAL_DIVISION:
 
             def next_rand(self: LCRNG32, maximum: np.uint16) -> np.uint16:
@@ -178,6 +317,16 @@ def lcrng32_init(
 
                 return rand_func
 
+            @optional_njit(parallel=True)
+            def next_rand_array(seeds: np.ndarray, maximum: np.uint16) -> np.ndarray:
+                rands = next_u16_array(seeds)
+                divisor = np.uint16(
+                    (np.uint16(0xFFFF) // np.uint16(maximum)) + np.uint16(1)
+                )
+                for i in optional_prange(rands.shape[0]):
+                    rands[i] = np.uint16(rands[i]) // divisor
+                return rands
+
         else:
 
             def next_rand(self: LCRNG32, maximum: np.uint16) -> np.uint16:
@@ -188,14 +337,25 @@ def lcrng32_init(
             ) -> Callable[[LCRNG32], np.uint16]:
                 raise NotImplementedError()
 
+            def next_rand_array(seeds: np.ndarray, maximum: np.uint16) -> np.ndarray:
+                raise NotImplementedError()
+
         lcrng_class.next = next_
         lcrng_class.jump = jump
         lcrng_class.next_rand = next_rand
 
         lcrng_class = optional_jitclass(lcrng_class)
 
-        lcrng_class.const_jump = const_jump
-        lcrng_class.const_rand = const_rand
+        lcrng_class.const_jump = memoized_const_function(lcrng_class, const_jump)
+        lcrng_class.const_rand = memoized_const_function(lcrng_class, const_rand)
+        lcrng_class.jump_constants = jump_constants
+        lcrng_class.distance = distance
+        lcrng_class.distance_array = distance_array
+        lcrng_class.next_array = next_array
+        lcrng_class.next_u16_array = next_u16_array
+        lcrng_class.next_rand_array = next_rand_array
+        lcrng_class.jump_array = jump_array
+        lcrng_class.jump_array_lanes = jump_array_lanes
 
         return lcrng_class
 
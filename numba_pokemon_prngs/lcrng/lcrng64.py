@@ -4,7 +4,12 @@ from __future__ import annotations
 from typing import Type, Callable
 import enum
 import numpy as np
-from ..compilation import optional_jitclass, optional_njit
+from ..compilation import (
+    optional_jitclass,
+    optional_njit,
+    optional_prange,
+    memoized_const_function,
+)
 from ..compatability import mod_inv
 
 
@@ -63,6 +68,24 @@ class LCRNG64:
         """
         raise NotImplementedError()
 
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] full 64-bit random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_u32(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_u32()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
     @staticmethod
     def const_jump(adv: np.uint64, **kwargs) -> Callable[[LCRNG64]]:
         """Compile @njit jump function with a const adv"""
@@ -73,6 +96,16 @@ class LCRNG64:
         """Compile @njit rand function with a const maximum"""
         raise NotImplementedError()
 
+    @staticmethod
+    def distance(seed_from: np.uint64, seed_to: np.uint64) -> np.uint64:
+        """Compute the amount of advances needed to go from seed_from to seed_to"""
+        raise NotImplementedError()
+
+    @staticmethod
+    def distance_array(seed_from: np.uint64, seeds_to: np.ndarray) -> np.ndarray:
+        """Compute the amount of advances needed to go from seed_from to each of seeds_to"""
+        raise NotImplementedError()
+
 
 def lcrng64_init(
     *,
@@ -102,6 +135,33 @@ def lcrng64_init(
         )
     jump_table = tuple(jump_table)
 
+    @optional_njit()
+    def distance(seed_from: np.uint64, seed_to: np.uint64) -> np.uint64:
+        # advancing by 2**i leaves the low i bits unchanged and always flips bit i,
+        # so the distance can be built up one bit at a time
+        seed_from = np.uint64(seed_from)
+        seed_to = np.uint64(seed_to)
+        result = np.uint64(0)
+        mask = np.uint64(1)
+        for i in range(64):
+            if seed_from == seed_to:
+                break
+            if (seed_from ^ seed_to) & mask:
+                add_val, mult_val = jump_table[i]
+                seed_from = np.uint64(
+                    seed_from * np.uint64(mult_val) + np.uint64(add_val)
+                )
+                result |= mask
+            mask = np.uint64(mask << np.uint64(1))
+        return result
+
+    @optional_njit(parallel=True)
+    def distance_array(seed_from: np.uint64, seeds_to: np.ndarray) -> np.ndarray:
+        distances = np.empty(seeds_to.shape[0], dtype=np.uint64)
+        for i in optional_prange(seeds_to.shape[0]):
+            distances[i] = distance(seed_from, seeds_to[i])
+        return distances
+
     def wrap(lcrng_class: Type[LCRNG64]) -> Type[LCRNG64]:
         def next_(self: LCRNG64) -> np.uint32:
             self.seed = np.uint64(
@@ -177,8 +237,10 @@ def lcrng64_init(
 
         lcrng_class = optional_jitclass(lcrng_class)
 
-        lcrng_class.const_jump = const_jump
-        lcrng_class.const_rand = const_rand
+        lcrng_class.const_jump = memoized_const_function(lcrng_class, const_jump)
+        lcrng_class.const_rand = memoized_const_function(lcrng_class, const_rand)
+        lcrng_class.distance = distance
+        lcrng_class.distance_array = distance_array
 
         return lcrng_class
 
@@ -0,0 +1,91 @@
+"""Recovery of LCRNG32 seeds from generated IVs"""
+
+from __future__ import annotations
+from typing import Callable, Sequence
+import functools
+import numpy as np
+from ..compilation import optional_njit
+from ..enums import Method
+from .lcrng32 import LCRNG32
+from . import PokeRNGMod, PokeRNGRMod, XDRNG, XDRNGR
+
+
+def build_iv_seed_recovery(
+    *,
+    rng_class: LCRNG32,
+    reverse_rng_class: LCRNG32,
+    iv_1_adv: int,
+    iv_2_gap: int,
+) -> Callable[[np.uint16, np.uint16], np.ndarray]:
+    """
+    Build an @njit function that recovers every origin seed that
+    generates the two 15-bit IV words with rng_class
+
+    iv_1_adv -> amount of advances from the origin seed to the seed of the first IV word
+
+    iv_2_gap -> amount of advances between the seeds of the two IV words
+    """
+    gap_add, gap_mult = rng_class.jump_constants(iv_2_gap)
+    origin_add, origin_mult = reverse_rng_class.jump_constants(iv_1_adv)
+
+    @optional_njit()
+    def recover_func(iv_1: np.uint16, iv_2: np.uint16) -> np.ndarray:
+        iv_1 = np.uint32(iv_1) & np.uint32(0x7FFF)
+        iv_2 = np.uint32(iv_2) & np.uint32(0x7FFF)
+        # the top bit of each IV word is unused, leaving 2 * 0x10000 possible seeds
+        seeds = np.empty(0x20000, np.uint32)
+        count = 0
+        for high in range(2):
+            base = np.uint32(
+                ((np.uint32(high) << np.uint32(15)) | iv_1) << np.uint32(16)
+            )
+            for low in range(0x10000):
+                seed = np.uint32(base | np.uint32(low))
+                next_seed = np.uint32(seed * np.uint32(gap_mult) + np.uint32(gap_add))
+                if (next_seed >> np.uint32(16)) & np.uint32(0x7FFF) == iv_2:
+                    seeds[count] = np.uint32(
+                        seed * np.uint32(origin_mult) + np.uint32(origin_add)
+                    )
+                    count += 1
+        return seeds[:count].copy()
+
+    return recover_func
+
+
+@functools.lru_cache(maxsize=None)
+def get_iv_seed_recovery(
+    method: Method,
+) -> Callable[[np.uint16, np.uint16], np.ndarray]:
+    """Get the (lazily built) @njit IV seed recovery function of method"""
+    if method == Method.METHOD_1:
+        # pid low, pid high, iv 1, iv 2
+        return build_iv_seed_recovery(
+            rng_class=PokeRNGMod, reverse_rng_class=PokeRNGRMod, iv_1_adv=3, iv_2_gap=1
+        )
+    if method == Method.METHOD_2:
+        # pid low, pid high, vblank, iv 1, iv 2
+        return build_iv_seed_recovery(
+            rng_class=PokeRNGMod, reverse_rng_class=PokeRNGRMod, iv_1_adv=4, iv_2_gap=1
+        )
+    if method == Method.METHOD_4:
+        # pid low, pid high, iv 1, vblank, iv 2
+        return build_iv_seed_recovery(
+            rng_class=PokeRNGMod, reverse_rng_class=PokeRNGRMod, iv_1_adv=3, iv_2_gap=2
+        )
+    if method == Method.XD_COLO:
+        # iv 1, iv 2, ability, pid high, pid low
+        return build_iv_seed_recovery(
+            rng_class=XDRNG, reverse_rng_class=XDRNGR, iv_1_adv=1, iv_2_gap=1
+        )
+    raise ValueError(f"IV seed recovery is not supported for {method!r}")
+
+
+def recover_iv_seeds(ivs: Sequence[int], method: Method) -> np.ndarray:
+    """
+    Recover every origin seed that generates ivs (HP, Atk, Def, SpA, SpD, Spe) via method
+
+    The origin seed is the seed before the first rand of the method is generated
+    """
+    iv_1 = ivs[0] | (ivs[1] << 5) | (ivs[2] << 10)
+    iv_2 = ivs[5] | (ivs[3] << 5) | (ivs[4] << 10)
+    return get_iv_seed_recovery(Method(method))(iv_1, iv_2)
@@ -0,0 +1,98 @@
+"""Parallel sweeps of the full LCRNG32 period with @njit predicates"""
+
+from __future__ import annotations
+from typing import Callable, Optional
+import numpy as np
+from ..compilation import optional_njit, optional_prange
+from ..search import search_chunks
+from .lcrng32 import LCRNG32
+
+
+@optional_njit(parallel=True)
+def sweep_chunks(
+    predicate: Callable[[np.uint32], bool],
+    chunk_seeds: np.ndarray,
+    chunk_size: np.uint32,
+    count: np.uint64,
+    add: np.uint32,
+    mult: np.uint32,
+    buffer_size: np.uint32,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run predicate on count seeds of the LCRNG sequence split into chunks starting at
+    chunk_seeds and return the (chunk_count, buffer_size) hits and per-chunk hit counts
+
+    Hits past buffer_size are counted but not stored
+    """
+    chunk_count = chunk_seeds.shape[0]
+    buffer_limit = np.uint64(buffer_size)
+    hits = np.empty((chunk_count, buffer_size), np.uint32)
+    hit_counts = np.zeros(chunk_count, np.uint64)
+    for chunk in optional_prange(chunk_count):
+        seed = np.uint32(chunk_seeds[chunk])
+        chunk_start = np.uint64(chunk) * np.uint64(chunk_size)
+        size = min(np.uint64(chunk_size), np.uint64(count) - chunk_start)
+        hit_count = np.uint64(0)
+        for _ in range(size):
+            if predicate(seed):
+                if hit_count < buffer_limit:
+                    hits[chunk, hit_count] = seed
+                hit_count += np.uint64(1)
+            seed = np.uint32(np.uint32(seed) * np.uint32(mult) + np.uint32(add))
+        hit_counts[chunk] = hit_count
+    return hits, hit_counts
+
+
+def sweep_lcrng32(
+    rng_class: LCRNG32,
+    predicate: Callable[[np.uint32], bool],
+    *,
+    initial_seed: np.uint32 = 0,
+    count: int = 0x100000000,
+    chunk_size: int = 0x10000,
+    chunks_per_batch: int = 0x400,
+    buffer_size: int = 0x10,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Run an @njit predicate(seed) -> bool on count consecutive seeds of the rng_class
+    sequence starting at initial_seed and return every seed it holds for
+
+    The default count covers the full 2^32 period.
+    Chunks of chunk_size seeds are started via jump and run in parallel,
+    chunks_per_batch at a time; progress(seeds_done, count) is called after every batch
+    """
+    add, mult = rng_class.jump_constants(1)
+    chunk_add, chunk_mult = rng_class.jump_constants(chunk_size)
+
+    def run_chunks(
+        start: int, batch_count: int, batch_buffer_size: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        start_add, start_mult = rng_class.jump_constants(start)
+        chunk_seeds = np.empty(-(-batch_count // chunk_size), np.uint32)
+        chunk_seeds[0] = np.uint32(
+            np.uint32(initial_seed) * np.uint32(start_mult) + np.uint32(start_add)
+        )
+        for i in range(1, chunk_seeds.shape[0]):
+            chunk_seeds[i] = np.uint32(
+                np.uint32(chunk_seeds[i - 1]) * np.uint32(chunk_mult)
+                + np.uint32(chunk_add)
+            )
+        return sweep_chunks(
+            predicate,
+            chunk_seeds,
+            chunk_size,
+            batch_count,
+            add,
+            mult,
+            batch_buffer_size,
+        )
+
+    return search_chunks(
+        run_chunks,
+        count,
+        chunk_size=chunk_size,
+        chunks_per_batch=chunks_per_batch,
+        buffer_size=buffer_size,
+        progress=progress,
+    )
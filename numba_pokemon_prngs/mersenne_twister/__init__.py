@@ -1,5 +1,6 @@
 """Mersenne Twister Based Pseudo Random Number Generators"""
 
-from .mt import MersenneTwister
+from .mt import MersenneTwister, MersenneTwisterBatch
 from .sfmt import SIMDFastMersenneTwister
-from .tinymt import TinyMersenneTwister
+from .tinymt import TinyMersenneTwister, TinyMersenneTwisterBatch
+from .sfmt_search import search_sfmt_chunks, search_sfmt_seeds
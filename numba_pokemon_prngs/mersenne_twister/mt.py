@@ -1,22 +1,75 @@
 """Mersenne Twister 19937 Pseudo Random Number Generator"""
 
 from __future__ import annotations
+import functools
+import importlib.resources as pkg_resources
 import numpy as np
-from ..compilation import optional_jitclass, array_type
+from ..compilation import optional_jitclass, optional_njit, array_type
+from ..resources.bin import jump as jump_bin_directory
+from .polynomial import minimal_polynomial, stride_polynomials, stride_jump
 
 MAG02 = (np.uint32(0), np.uint32(0x9908B0DF))
+INIT_MULT_INVERSE = np.uint32(0x9638806D)  # 0x6C078965^-1 mod 2^32
+# shuffle count of states too far from re_init to track
+UNKNOWN_SHUFFLES = np.uint32(0xFFFFFFFF)
+# advances past which one jump is cheaper than shuffling 624 at a time
+JUMP_BITS = 21
+JUMP_THRESHOLD = 1 << JUMP_BITS
+# JUMP_POLYNOMIALS[k - JUMP_BITS] -> t^(2^k) mod the characteristic polynomial
+# as generated by jump_polynomials()
+JUMP_POLYNOMIALS = np.frombuffer(
+    pkg_resources.read_binary(jump_bin_directory, "jump_mt"), dtype=np.uint64
+).reshape(64 - JUMP_BITS, 312)
+
+
+@optional_njit()
+def temper(y_rand: np.uint32) -> np.uint32:
+    """Temper a state word into a 32-bit rand"""
+    y_rand = np.uint32(y_rand)
+    y_rand ^= y_rand >> np.uint32(11)
+    y_rand ^= (y_rand << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y_rand ^= (y_rand << np.uint32(15)) & np.uint32(0xEFC60000)
+    y_rand ^= y_rand >> np.uint32(18)
+    return y_rand
+
+
+@optional_njit()
+def untemper(rand: np.uint32) -> np.uint32:
+    """Recover the state word a 32-bit rand was tempered from"""
+    rand = np.uint32(rand)
+    rand ^= rand >> np.uint32(18)
+    rand ^= (rand << np.uint32(15)) & np.uint32(0xEFC60000)
+    # each pass recovers 7 more low bits
+    y_rand = rand
+    for _ in range(4):
+        y_rand = rand ^ ((y_rand << np.uint32(7)) & np.uint32(0x9D2C5680))
+    # each pass recovers 11 more high bits
+    rand = y_rand
+    for _ in range(2):
+        y_rand = rand ^ (y_rand >> np.uint32(11))
+    return y_rand
+
+
+@optional_njit()
+def twist_word(buffer: np.ndarray, position: int) -> None:
+    """Compute buffer[position + 624] from the 624 words starting at position"""
+    y_val = (buffer[position] & np.uint32(0x80000000)) | (
+        buffer[position + 1] & np.uint32(0x7FFFFFFF)
+    )
+    buffer[position + 624] = (
+        (y_val >> np.uint32(1)) ^ MAG02[y_val & np.uint32(1)] ^ buffer[position + 397]
+    )
 
 
-# TODO: jump tables
 # TODO: staticmethod const functions
 # TODO: init_by_array
-# TODO: reverse next
 @optional_jitclass
 class MersenneTwister:
     """Mersenne Twister Pseudo Random Number Generator"""
 
     state: array_type(np.uint32)  # contiguous array
     index: np.uint16
+    shuffles: np.uint32  # shuffles since re_init, stepping back past 0 is invalid
 
     def __init__(self, seed: np.uint32) -> None:
         seed = np.uint32(seed)
@@ -28,6 +81,7 @@ class MersenneTwister:
         """Reinitialize without creating a new object"""
         seed = np.uint32(seed)
         self.index = np.uint16(624)  # ensures shuffle after initialization
+        self.shuffles = np.uint32(0)
         self.state[0] = seed
 
         for i in range(1, 624):
@@ -39,12 +93,39 @@ class MersenneTwister:
     def advance(self, adv: np.uint32) -> None:
         """Advance Mersenne Twister sequence by adv"""
         adv = np.uint32(adv)
+        if adv >= np.uint32(JUMP_THRESHOLD):
+            self.jump(adv)
+            return
         adv += np.uint32(self.index)
         while adv >= np.uint32(624):
             self.shuffle()
             adv -= np.uint32(624)
         self.index = np.uint16(adv)
 
+    def jump(self, adv: np.uint64) -> None:
+        """Jump ahead by adv, combining the precomputed jumps by each set bit of adv
+        from JUMP_BITS up with shuffling for the bits below"""
+        adv = np.uint64(adv)
+        remaining = (adv & np.uint64(JUMP_THRESHOLD - 1)) + np.uint64(self.index)
+        while remaining >= np.uint64(624):
+            self.shuffle()
+            remaining -= np.uint64(624)
+        self.index = np.uint16(remaining)
+
+        if adv >> np.uint64(JUMP_BITS):
+            # window of the 624 words starting at the next output
+            stride_jump(
+                self.state,
+                self.index,
+                adv,
+                JUMP_POLYNOMIALS,
+                JUMP_BITS,
+                twist_word,
+                1,
+            )
+            self.index = np.uint16(0)
+            self.shuffles = UNKNOWN_SHUFFLES
+
     def next(self) -> np.uint32:
         """Access and return the next 32-bit tempered rand"""
         if self.index == np.uint16(624):
@@ -53,12 +134,20 @@ class MersenneTwister:
         y_rand = self.state[self.index]
         self.index += np.uint16(1)
 
-        y_rand ^= y_rand >> np.uint32(11)
-        y_rand ^= (y_rand << np.uint32(7)) & np.uint32(0x9D2C5680)
-        y_rand ^= (y_rand << np.uint32(15)) & np.uint32(0xEFC60000)
-        y_rand ^= y_rand >> np.uint32(18)
+        return temper(y_rand)
+
+    def previous(self) -> np.uint32:
+        """Step back and return the 32-bit tempered rand last returned by next()"""
+        # the state straight from re_init was never returned
+        assert self.shuffles > np.uint32(1) or (
+            self.shuffles == np.uint32(1) and self.index != np.uint16(0)
+        ), "No rand has been generated since re_init"
+        if self.index == np.uint16(0):
+            self.unshuffle()
 
-        return y_rand
+        self.index -= np.uint16(1)
+
+        return temper(self.state[self.index])
 
     def shuffle(self) -> None:
         """Advance and shuffle the entire state (624 advances)"""
@@ -79,6 +168,40 @@ class MersenneTwister:
         state[623] = (y_val >> one) ^ MAG02[y_val & one] ^ state[396]
 
         self.index = np.uint16(0)
+        if self.shuffles != UNKNOWN_SHUFFLES:
+            self.shuffles += np.uint32(1)
+
+    def unshuffle(self) -> None:
+        """Undo the last shuffle, restoring the previous 624 state words
+
+        The low 31 bits of word 0 are only recoverable when the words before it
+        were shuffled too, i.e. not for the state straight from re_init"""
+        state = self.state
+        upper_mask = np.uint32(0x80000000)
+        lower_mask = np.uint32(0x7FFFFFFF)
+        one = np.uint32(1)
+
+        # walk backwards so every word read is still in the form the shuffle saw
+        for i in range(623, -1, -1):
+            # recover y_val of word i for the upper bit of the restored word
+            y_val = state[i] ^ state[(i + 397) % 624]
+            y_upper = (
+                ((y_val ^ MAG02[1]) << one) | one
+                if y_val & upper_mask
+                else y_val << one
+            )
+            # recover y_val of word i - 1 for the lower bits of the restored word
+            y_val = state[(i + 623) % 624] ^ state[(i + 396) % 624]
+            y_lower = (
+                ((y_val ^ MAG02[1]) << one) | one
+                if y_val & upper_mask
+                else y_val << one
+            )
+            state[i] = (y_upper & upper_mask) | (y_lower & lower_mask)
+
+        self.index = np.uint16(624)
+        if np.uint32(0) < self.shuffles < UNKNOWN_SHUFFLES:
+            self.shuffles -= np.uint32(1)
 
     def next_rand(self, maximum: np.uint32) -> np.uint32:
         """Generate and return the next [0, maximum) random uint
@@ -88,3 +211,211 @@ class MersenneTwister:
     def next_rand_mod(self, maximum: np.uint32) -> np.uint32:
         """Generate and return the next [0, maximum) random uint via modulo distribution"""
         return self.next() % np.uint32(maximum)
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit tempered rands"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints
+        via multiplication-shift distribution"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
+    def fill_rand_mod(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints
+        via modulo distribution"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand_mod(maximum)
+        return out
+
+
+@optional_jitclass
+class MersenneTwisterBatch:
+    """Mersenne Twister run in lockstep over a batch of seeds
+
+    The state is stored word-major as (624, seed_count) so every step of the
+    recurrence is a contiguous vector operation across seeds"""
+
+    state: array_type(np.uint32, 2)  # contiguous array
+    index: np.uint16
+
+    def __init__(self, seeds: np.ndarray) -> None:
+        self.state = np.empty((624, seeds.shape[0]), dtype=np.uint32)
+        self.index = np.uint16(624)  # ensures shuffle after initialization
+        self.re_init(seeds)
+
+    def re_init(self, seeds: np.ndarray) -> None:
+        """Reinitialize every lane without creating a new object"""
+        state = self.state  # accessing self.state directly fails to vectorize
+        self.index = np.uint16(624)  # ensures shuffle after initialization
+        for lane in range(state.shape[1]):
+            state[0, lane] = np.uint32(seeds[lane])
+        for i in range(1, 624):
+            for lane in range(state.shape[1]):
+                seed = state[i - 1, lane]
+                state[i, lane] = np.uint32(
+                    np.uint32(0x6C078965) * (seed ^ (seed >> np.uint32(30)))
+                    + np.uint32(i)
+                )
+
+    def advance(self, adv: np.uint32) -> None:
+        """Advance every lane by adv"""
+        adv = np.uint32(adv)
+        adv += np.uint32(self.index)
+        while adv >= np.uint32(624):
+            self.shuffle()
+            adv -= np.uint32(624)
+        self.index = np.uint16(adv)
+
+    def next(self) -> np.ndarray:
+        """Access and return the next 32-bit tempered rand of every lane"""
+        return self.next_into(np.empty(self.state.shape[1], dtype=np.uint32))
+
+    def next_into(self, out: np.ndarray) -> np.ndarray:
+        """Write the next 32-bit tempered rand of every lane to out"""
+        if self.index == np.uint16(624):
+            self.shuffle()
+
+        state = self.state
+        index = self.index
+        self.index += np.uint16(1)
+
+        for lane in range(state.shape[1]):
+            out[lane] = temper(state[index, lane])
+
+        return out
+
+    def shuffle(self) -> None:
+        """Advance and shuffle the entire state of every lane (624 advances)"""
+        state = self.state  # accessing self.state directly fails to vectorize
+        upper_mask = np.uint32(0x80000000)
+        lower_mask = np.uint32(0x7FFFFFFF)
+        one = np.uint32(1)
+
+        for i in range(624):
+            next_i = i + 1 if i != 623 else 0
+            far_i = i + 397 if i < 227 else i - 227
+            for lane in range(state.shape[1]):
+                y_val = (state[i, lane] & upper_mask) | (
+                    state[next_i, lane] & lower_mask
+                )
+                state[i, lane] = (
+                    (y_val >> one)
+                    # MAG02[y_val & 1] without a per-lane table lookup
+                    ^ np.uint32((y_val & one) * MAG02[1])
+                    ^ state[far_i, lane]
+                )
+
+        self.index = np.uint16(0)
+
+    def next_rand(self, maximum: np.uint32) -> np.ndarray:
+        """Generate and return the next [0, maximum) random uint of every lane
+        via multiplication-shift distribution"""
+        rands = self.next()
+        for lane in range(rands.shape[0]):
+            rands[lane] = np.uint32(
+                (np.uint64(rands[lane]) * np.uint64(maximum)) >> np.uint64(32)
+            )
+        return rands
+
+    def next_rand_mod(self, maximum: np.uint32) -> np.ndarray:
+        """Generate and return the next [0, maximum) random uint of every lane
+        via modulo distribution"""
+        rands = self.next()
+        for lane in range(rands.shape[0]):
+            rands[lane] = rands[lane] % np.uint32(maximum)
+        return rands
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit tempered rands of every lane
+        as a (count, seed_count) array"""
+        for i in range(out.shape[0]):
+            self.next_into(out[i])
+        return out
+
+
+@functools.lru_cache(maxsize=None)
+def characteristic_polynomial() -> int:
+    """Characteristic polynomial of the MT19937 one word twist as a bit-packed int
+    found via Berlekamp-Massey on the most significant bits of the state words"""
+    rng = MersenneTwister(0)
+    bits = []
+    while len(bits) < 19937 * 2:
+        rng.shuffle()
+        bits.extend((rng.state >> np.uint32(31)).tolist())
+    return minimal_polynomial(bits[: 19937 * 2])
+
+
+def jump_polynomials() -> np.ndarray:
+    """Compute JUMP_POLYNOMIALS from the characteristic polynomial"""
+    return stride_polynomials(characteristic_polynomial(), JUMP_BITS, 64, 312)
+
+
+@optional_njit()
+def fill_prefix(seed: np.uint32, out: np.ndarray) -> np.ndarray:
+    """Fill out with the first out.shape[0] <= 227 tempered rands of seed
+
+    Only the state words feeding those rands are initialized and twisted,
+    without allocating a full 624 word state"""
+    count = out.shape[0]
+    assert count <= 227, "Prefix is longer than 227 rands"
+    seed = np.uint32(seed)
+    upper_mask = np.uint32(0x80000000)
+    lower_mask = np.uint32(0x7FFFFFFF)
+    one = np.uint32(1)
+    mult = np.uint32(0x6C078965)
+    shift = np.uint32(30)
+    # out[:count] holds state words 0..count - 1 until they are twisted
+    for i in range(count):
+        out[i] = seed
+        seed = np.uint32(mult * (seed ^ (seed >> shift)) + np.uint32(i + 1))
+    last = seed
+    for i in range(count, 397):
+        seed = np.uint32(mult * (seed ^ (seed >> shift)) + np.uint32(i + 1))
+    for j in range(count):
+        y_val = (out[j] & upper_mask) | (
+            (out[j + 1] if j + 1 < count else last) & lower_mask
+        )
+        out[j] = temper((y_val >> one) ^ MAG02[y_val & one] ^ seed)
+        seed = np.uint32(mult * (seed ^ (seed >> shift)) + np.uint32(j + 398))
+    return out
+
+
+@optional_njit()
+def prefix(seed: np.uint32, count: int) -> np.ndarray:
+    """Generate the first count <= 227 tempered rands of seed via fill_prefix"""
+    return fill_prefix(seed, np.empty(count, dtype=np.uint32))
+
+
+@optional_njit()
+def from_outputs(outputs: np.ndarray) -> MersenneTwister:
+    """Rebuild a MersenneTwister from 624 consecutive tempered rands
+    positioned to return the rand following them"""
+    assert outputs.shape[0] == 624, "624 outputs are needed to recover the state"
+    rng = MersenneTwister(0)
+    for i in range(624):
+        rng.state[i] = untemper(outputs[i])
+    rng.index = np.uint16(624)
+    rng.shuffles = UNKNOWN_SHUFFLES
+    return rng
+
+
+@optional_njit()
+def recover_seed(word: np.uint32, position: int) -> np.uint32:
+    """Invert re_init, recovering the seed from the state word at position
+    of a freshly initialized state"""
+    word = np.uint32(word)
+    for i in range(position, 0, -1):
+        word = np.uint32((word - np.uint32(i)) * INIT_MULT_INVERSE)
+        word ^= word >> np.uint32(30)
+    return word
+
+
+MersenneTwister.fill_prefix = fill_prefix
+MersenneTwister.prefix = prefix
+MersenneTwister.from_outputs = from_outputs
+MersenneTwister.recover_seed = recover_seed
@@ -0,0 +1,140 @@
+"""GF(2) polynomial arithmetic on bit-packed ints for jumping F2-linear PRNGs"""
+
+from __future__ import annotations
+from typing import Iterable
+import numpy as np
+from ..compilation import optional_njit
+
+
+def minimal_polynomial(bits: Iterable[int]) -> int:
+    """Minimal polynomial of a bit sequence via Berlekamp-Massey as a bit-packed int
+
+    Needs at least twice as many bits as the degree of the polynomial"""
+    connection, previous = 1, 1
+    degree, gap = 0, 1
+    window = 0
+    for i, bit in enumerate(bits):
+        window = (window << 1) | bit
+        if bin(connection & window).count("1") & 1:
+            last_connection = connection
+            connection ^= previous << gap
+            if 2 * degree <= i:
+                degree = i + 1 - degree
+                previous = last_connection
+                gap = 0
+        gap += 1
+    # the minimal polynomial is the reciprocal of the connection polynomial
+    return int(format(connection, f"0{degree + 1}b")[::-1], 2)
+
+
+def reduce_polynomial(polynomial: int, modulus: int) -> int:
+    """Compute polynomial mod modulus"""
+    degree = modulus.bit_length() - 1
+    while polynomial.bit_length() > degree:
+        polynomial ^= modulus << (polynomial.bit_length() - 1 - degree)
+    return polynomial
+
+
+def square_polynomial(polynomial: int) -> int:
+    """Compute polynomial^2, squaring over GF(2) interleaving zeros between the bits"""
+    return int(bin(polynomial)[2:].replace("", "0")[:-1], 2)
+
+
+def power_mod(exponent: int, modulus: int) -> int:
+    """Compute t^exponent mod modulus"""
+    result = 1
+    for bit in bin(exponent)[2:]:
+        result = reduce_polynomial(square_polynomial(result), modulus)
+        if bit == "1":
+            result = reduce_polynomial(result << 1, modulus)
+    return result
+
+
+def stride_polynomials(
+    modulus: int, first_bit: int, last_bit: int, word_count: int
+) -> np.ndarray:
+    """Compute t^(2^k) mod modulus for k in [first_bit, last_bit)
+    as a (last_bit - first_bit, word_count) uint64 array"""
+    polynomials = np.empty((last_bit - first_bit, word_count), dtype=np.uint64)
+    polynomial = power_mod(1 << first_bit, modulus)
+    for i in range(polynomials.shape[0]):
+        polynomials[i] = pack_polynomial(polynomial, word_count)
+        polynomial = reduce_polynomial(square_polynomial(polynomial), modulus)
+    return polynomials
+
+
+def pack_polynomial(polynomial: int, word_count: int) -> np.ndarray:
+    """Pack a polynomial into read-only uint64 words, least significant first"""
+    return np.frombuffer(polynomial.to_bytes(word_count * 8, "little"), dtype=np.uint64)
+
+
+@optional_njit()
+def evaluate_jump(
+    window: np.ndarray, polynomial: np.ndarray, recursion_word, word_size: int
+) -> np.ndarray:
+    """Evaluate polynomial(F) @ window where recursion_word(buffer, i) computes
+    the word of word_size uint32s following the window of the words from word i
+
+    Horner's method steps through the coefficients 8 at a time,
+    adding a precomputed combination of F^0..F^7 @ window per step"""
+    state_size = window.shape[0]
+    # steps[b * word_size:][:state_size] -> F^b @ window
+    steps = np.empty(state_size + 7 * word_size, dtype=np.uint32)
+    steps[:state_size] = window
+    for i in range(7):
+        recursion_word(steps, i)
+    # table[m] -> sum of F^b @ window over the set bits b of m
+    table = np.zeros((256, state_size), dtype=np.uint32)
+    for m in range(1, 256):
+        lowest_bit = 0
+        while not (m >> lowest_bit) & 1:
+            lowest_bit += 1
+        offset = lowest_bit * word_size
+        table[m] = table[m & (m - 1)] ^ steps[offset : offset + state_size]
+
+    coefficient_count = polynomial.shape[0] * 64
+    result = np.zeros(state_size + (coefficient_count - 1) * word_size, dtype=np.uint32)
+    for chunk in range(coefficient_count >> 3):
+        for i in range(max(chunk * 8 - 1, 0), chunk * 8 + 7):
+            recursion_word(result, i)
+        bit = coefficient_count - 8 - chunk * 8
+        coefficients = (polynomial[bit >> 6] >> np.uint64(bit & 63)) & np.uint64(0xFF)
+        if coefficients:
+            offset = (chunk * 8 + 7) * word_size
+            for i in range(state_size):
+                result[offset + i] ^= table[coefficients, i]
+    return result[(coefficient_count - 1) * word_size :]
+
+
+@optional_njit()
+def stride_jump(
+    state: np.ndarray,
+    start: int,
+    adv: np.uint64,
+    polynomials: np.ndarray,
+    first_bit: int,
+    recursion_word,
+    word_size: int,
+) -> None:
+    """Jump state ahead by the bits of adv from first_bit up in place
+    where polynomials[k - first_bit] is the jump by 2^k as used by evaluate_jump
+
+    The jumped window starts start words into state,
+    every later jump starting from the previous result"""
+    adv = np.uint64(adv)
+    start = np.int64(start)
+    state_size = state.shape[0]
+    for k in range(first_bit, 64):
+        if not (adv >> np.uint64(k)) & np.uint64(1):
+            continue
+        window = np.empty(state_size + start * word_size, dtype=np.uint32)
+        window[:state_size] = state
+        for i in range(start):
+            recursion_word(window, i)
+        state[:] = evaluate_jump(
+            window[start * word_size :],
+            polynomials[k - first_bit],
+            recursion_word,
+            word_size,
+        )
+        start = np.int64(0)
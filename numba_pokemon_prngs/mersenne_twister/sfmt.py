@@ -1,13 +1,32 @@
 """SIMD-oriented Fast Mersenne Twister 19937 Pseudo Random Number Generator"""
 
 from __future__ import annotations
+import functools
+import importlib.resources as pkg_resources
 import numpy as np
 from ..compilation import (
     optional_jitclass,
     optional_ir_function,
+    optional_njit,
     array_type,
 )
 from ..options import USE_NUMBA
+from ..resources.bin import jump as jump_bin_directory
+from .polynomial import minimal_polynomial, stride_polynomials, stride_jump
+
+
+SFMT_MASK = np.array((0xDFFFFFEF, 0xDDFECB7F, 0xBFFAFFFF, 0xBFFFFFF6), dtype=np.uint32)
+# bits of each 32-bit lane of a 128-bit int that survive a lane-wise << 18
+SL1_LANE_MASK = int.from_bytes(np.full(4, 0xFFFC0000, np.uint32).tobytes(), "little")
+U64_MASK = (1 << 64) - 1
+# 64-bit rands past which one jump is cheaper than shuffling 312 at a time
+JUMP_BITS = 20
+JUMP_THRESHOLD = 1 << JUMP_BITS
+# JUMP_POLYNOMIALS[k - JUMP_BITS] -> t^(2^(k - 1)) mod the characteristic polynomial
+# (the jump by 2^k rands) as generated by jump_polynomials()
+JUMP_POLYNOMIALS = np.frombuffer(
+    pkg_resources.read_binary(jump_bin_directory, "jump_sfmt"), dtype=np.uint64
+).reshape(64 - JUMP_BITS, 312)
 
 
 def sfmt_shuffle(state: np.ndarray):
@@ -15,109 +34,37 @@ def sfmt_shuffle(state: np.ndarray):
     # the contents of this function are only ever used when USE_NUMBA is set to False
     # otherwise, it is overloaded with the ir version
 
-    # compute the first two states manually
-
-    x_0 = state[0] << 8
-    x_1 = (state[1] << 8) | (state[0] >> 24)
-    x_2 = (state[2] << 8) | (state[1] >> 24)
-    x_3 = (state[3] << 8) | (state[2] >> 24)
-
-    y_0 = (state[617] << 24) | (state[616] >> 8)
-    y_1 = (state[618] << 24) | (state[617] >> 8)
-    y_2 = (state[619] << 24) | (state[618] >> 8)
-    y_3 = state[619] >> 8
-
-    b_0 = (state[488] >> 11) & 0xDFFFFFEF
-    b_1 = (state[489] >> 11) & 0xDDFECB7F
-    b_2 = (state[490] >> 11) & 0xBFFAFFFF
-    b_3 = (state[491] >> 11) & 0xBFFFFFF6
-
-    d_0 = state[620] << 18
-    d_1 = state[621] << 18
-    d_2 = state[622] << 18
-    d_3 = state[623] << 18
-
-    state[0] ^= x_0 ^ y_0 ^ b_0 ^ d_0
-    state[1] ^= x_1 ^ y_1 ^ b_1 ^ d_1
-    state[2] ^= x_2 ^ y_2 ^ b_2 ^ d_2
-    state[3] ^= x_3 ^ y_3 ^ b_3 ^ d_3
-
-    x_0 = state[4] << 8
-    x_1 = (state[5] << 8) | (state[4] >> 24)
-    x_2 = (state[6] << 8) | (state[5] >> 24)
-    x_3 = (state[7] << 8) | (state[6] >> 24)
-
-    y_0 = (state[621] << 24) | (state[620] >> 8)
-    y_1 = (state[622] << 24) | (state[621] >> 8)
-    y_2 = (state[623] << 24) | (state[622] >> 8)
-    y_3 = state[623] >> 8
-
-    b_0 = (state[492] >> 11) & 0xDFFFFFEF
-    b_1 = (state[493] >> 11) & 0xDDFECB7F
-    b_2 = (state[494] >> 11) & 0xBFFAFFFF
-    b_3 = (state[495] >> 11) & 0xBFFFFFF6
-
-    d_0 = state[0] << 18
-    d_1 = state[1] << 18
-    d_2 = state[2] << 18
-    d_3 = state[3] << 18
-
-    state[4] ^= x_0 ^ y_0 ^ b_0 ^ d_0
-    state[5] ^= x_1 ^ y_1 ^ b_1 ^ d_1
-    state[6] ^= x_2 ^ y_2 ^ b_2 ^ d_2
-    state[7] ^= x_3 ^ y_3 ^ b_3 ^ d_3
-
-    for i in range(8, 136, 4):
-        x_0 = state[i] << 8
-        x_1 = (state[i + 1] << 8) | (state[i] >> 24)
-        x_2 = (state[i + 2] << 8) | (state[i + 1] >> 24)
-        x_3 = (state[i + 3] << 8) | (state[i + 2] >> 24)
-
-        b_0 = (state[i + 488] >> 11) & 0xDFFFFFEF
-        b_1 = (state[i + 489] >> 11) & 0xDDFECB7F
-        b_2 = (state[i + 490] >> 11) & 0xBFFAFFFF
-        b_3 = (state[i + 491] >> 11) & 0xBFFFFFF6
-
-        d_0 = state[i - 4] << 18
-        d_1 = state[i - 3] << 18
-        d_2 = state[i - 2] << 18
-        d_3 = state[i - 1] << 18
-
-        y_0 = (state[i - 7] << 24) | (state[i - 8] >> 8)
-        y_1 = (state[i - 6] << 24) | (state[i - 7] >> 8)
-        y_2 = (state[i - 5] << 24) | (state[i - 6] >> 8)
-        y_3 = state[i - 5] >> 8
-
-        state[i] ^= x_0 ^ b_0 ^ d_0 ^ y_0
-        state[i + 1] ^= x_1 ^ b_1 ^ d_1 ^ y_1
-        state[i + 2] ^= x_2 ^ b_2 ^ d_2 ^ y_2
-        state[i + 3] ^= x_3 ^ b_3 ^ d_3 ^ y_3
-
-    for i in range(136, 624, 4):
-        x_0 = state[i] << 8
-        x_1 = (state[i + 1] << 8) | (state[i] >> 24)
-        x_2 = (state[i + 2] << 8) | (state[i + 1] >> 24)
-        x_3 = (state[i + 3] << 8) | (state[i + 2] >> 24)
-
-        b_0 = (state[i - 136] >> 11) & 0xDFFFFFEF
-        b_1 = (state[i - 135] >> 11) & 0xDDFECB7F
-        b_2 = (state[i - 134] >> 11) & 0xBFFAFFFF
-        b_3 = (state[i - 133] >> 11) & 0xBFFFFFF6
-
-        d_0 = state[i - 4] << 18
-        d_1 = state[i - 3] << 18
-        d_2 = state[i - 2] << 18
-        d_3 = state[i - 1] << 18
-
-        y_0 = (state[i - 7] << 24) | (state[i - 8] >> 8)
-        y_1 = (state[i - 6] << 24) | (state[i - 7] >> 8)
-        y_2 = (state[i - 5] << 24) | (state[i - 6] >> 8)
-        y_3 = state[i - 5] >> 8
-
-        state[i] ^= x_0 ^ b_0 ^ d_0 ^ y_0
-        state[i + 1] ^= x_1 ^ b_1 ^ d_1 ^ y_1
-        state[i + 2] ^= x_2 ^ b_2 ^ d_2 ^ y_2
-        state[i + 3] ^= x_3 ^ b_3 ^ d_3 ^ y_3
+    words = state.reshape(156, 4)
+    wide_words = state.view(np.uint64).reshape(156, 2)
+    # the 128-bit words as python ints for the terms depending on the last 2 words
+    low, high = wide_words[154].tolist()
+    prev_2 = low | (high << 64)
+    low, high = wide_words[155].tolist()
+    prev_1 = low | (high << 64)
+
+    # POS1 only reaches 34 words back into the already shuffled words
+    # so every block of 34 words can compute its other terms at once
+    for start in range(0, 156, 34):
+        end = min(start + 34, 156)
+        block = words[start:end]
+        pos1 = (
+            words[start + 122 : end + 122]
+            if start == 0
+            else words[start - 34 : end - 34]
+        )
+        shifted = block << np.uint32(8)
+        shifted[:, 1:] |= block[:, :-1] >> np.uint32(24)
+        partial = block ^ shifted ^ ((pos1 >> np.uint32(11)) & SFMT_MASK)
+
+        shuffled = []
+        for low, high in partial.view(np.uint64).tolist():
+            word = (
+                (low | (high << 64)) ^ (prev_2 >> 8) ^ ((prev_1 << 18) & SL1_LANE_MASK)
+            )
+            shuffled.append(word & U64_MASK)
+            shuffled.append(word >> 64)
+            prev_2, prev_1 = prev_1, word
+        wide_words[start:end] = np.array(shuffled, dtype=np.uint64).reshape(-1, 2)
 
 
 if USE_NUMBA:
@@ -257,7 +204,61 @@ if USE_NUMBA:
         return impl_ret_untracked(context, builder, signature.return_type, None)
 
 
-# TODO: jump tables
+@optional_njit()
+def sfmt_recursion_word(buffer: np.ndarray, position: int) -> None:
+    """Compute the 128-bit word position + 156 of buffer (4 uint32 each)
+    from the 156 words starting at position"""
+    a_i = position * 4
+    b_i = a_i + 488
+    c_i = a_i + 616
+    d_i = a_i + 620
+    r_i = a_i + 624
+    x_0 = np.uint32(buffer[a_i] << np.uint32(8))
+    x_1 = np.uint32(buffer[a_i + 1] << np.uint32(8)) | (buffer[a_i] >> np.uint32(24))
+    x_2 = np.uint32(buffer[a_i + 2] << np.uint32(8)) | (
+        buffer[a_i + 1] >> np.uint32(24)
+    )
+    x_3 = np.uint32(buffer[a_i + 3] << np.uint32(8)) | (
+        buffer[a_i + 2] >> np.uint32(24)
+    )
+    y_0 = np.uint32(buffer[c_i + 1] << np.uint32(24)) | (buffer[c_i] >> np.uint32(8))
+    y_1 = np.uint32(buffer[c_i + 2] << np.uint32(24)) | (
+        buffer[c_i + 1] >> np.uint32(8)
+    )
+    y_2 = np.uint32(buffer[c_i + 3] << np.uint32(24)) | (
+        buffer[c_i + 2] >> np.uint32(8)
+    )
+    y_3 = buffer[c_i + 3] >> np.uint32(8)
+    buffer[r_i] = (
+        buffer[a_i]
+        ^ x_0
+        ^ y_0
+        ^ ((buffer[b_i] >> np.uint32(11)) & np.uint32(0xDFFFFFEF))
+        ^ np.uint32(buffer[d_i] << np.uint32(18))
+    )
+    buffer[r_i + 1] = (
+        buffer[a_i + 1]
+        ^ x_1
+        ^ y_1
+        ^ ((buffer[b_i + 1] >> np.uint32(11)) & np.uint32(0xDDFECB7F))
+        ^ np.uint32(buffer[d_i + 1] << np.uint32(18))
+    )
+    buffer[r_i + 2] = (
+        buffer[a_i + 2]
+        ^ x_2
+        ^ y_2
+        ^ ((buffer[b_i + 2] >> np.uint32(11)) & np.uint32(0xBFFAFFFF))
+        ^ np.uint32(buffer[d_i + 2] << np.uint32(18))
+    )
+    buffer[r_i + 3] = (
+        buffer[a_i + 3]
+        ^ x_3
+        ^ y_3
+        ^ ((buffer[b_i + 3] >> np.uint32(11)) & np.uint32(0xBFFFFFF6))
+        ^ np.uint32(buffer[d_i + 3] << np.uint32(18))
+    )
+
+
 # TODO: staticmethod const functions
 # TODO: reverse next
 @optional_jitclass
@@ -298,12 +299,41 @@ class SIMDFastMersenneTwister:
     def advance(self, adv: np.uint32) -> None:
         """Advance SIMD-oriented Fast Mersenne Twister sequence by adv"""
         adv = np.uint32(adv)
+        if adv >= np.uint32(JUMP_THRESHOLD):
+            self.jump(adv)
+            return
         adv = (adv * np.uint32(2)) + np.uint32(self.index)
         while adv >= np.uint32(624):
             self.shuffle()
             adv -= np.uint32(624)
         self.index = np.uint16(adv)
 
+    def jump(self, adv: np.uint64) -> None:
+        """Jump ahead by adv 64-bit rands, combining the precomputed jumps by each
+        set bit of adv from JUMP_BITS up with shuffling for the bits below"""
+        adv = np.uint64(adv)
+        remaining = (adv & np.uint64(JUMP_THRESHOLD - 1)) * np.uint64(2) + np.uint64(
+            self.index
+        )
+        while remaining >= np.uint64(624):
+            self.shuffle()
+            remaining -= np.uint64(624)
+        self.index = np.uint16(remaining)
+
+        if adv >> np.uint64(JUMP_BITS):
+            # window of the 156 128-bit words starting at the word of the next rand
+            # whole words are jumped so the next rand keeps its half of the word
+            stride_jump(
+                self.state,
+                self.index >> 2,
+                adv,
+                JUMP_POLYNOMIALS,
+                JUMP_BITS,
+                sfmt_recursion_word,
+                4,
+            )
+            self.index &= np.uint16(2)
+
     def next(self) -> np.uint64:
         """Access and return the next 64-bit rand"""
         if self.index == np.uint16(624):
@@ -326,3 +356,33 @@ class SIMDFastMersenneTwister:
     def next_rand(self, maximum: np.uint64) -> np.uint64:
         """Generate and return the next [0, maximum) random uint via modulo distribution"""
         return self.next() % np.uint64(maximum)
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 64-bit rands"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint64) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints
+        via modulo distribution"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
+
+@functools.lru_cache(maxsize=None)
+def characteristic_polynomial() -> int:
+    """Characteristic polynomial of the SFMT19937 128-bit word recursion as a
+    bit-packed int found via Berlekamp-Massey on the low bits of the state words"""
+    rng = SIMDFastMersenneTwister(0)
+    bits = []
+    while len(bits) < 19968 * 2:
+        rng.shuffle()
+        bits.extend((rng.state[::4] & np.uint32(1)).tolist())
+    return minimal_polynomial(bits[: 19968 * 2])
+
+
+def jump_polynomials() -> np.ndarray:
+    """Compute JUMP_POLYNOMIALS from the characteristic polynomial"""
+    return stride_polynomials(characteristic_polynomial(), JUMP_BITS - 1, 63, 312)
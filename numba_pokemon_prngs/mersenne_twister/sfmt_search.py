@@ -0,0 +1,217 @@
+"""Parallel search of SFMT19937 initial seeds from observed rands"""
+
+from __future__ import annotations
+from typing import Callable, Optional, Sequence
+import numpy as np
+from ..compilation import optional_njit, optional_prange
+from ..search import search_chunks
+from .sfmt import SFMT_MASK
+
+# seeds run through the init recurrence together so the lanes vectorize
+LANES = 64
+# POS1 only reads words that have not been shuffled yet for the first 34 words
+MAX_WORDS = 34
+
+
+@optional_njit()
+def sfmt_prefix_matches(
+    head: np.ndarray,
+    pos1: np.ndarray,
+    tail: np.ndarray,
+    rands: np.ndarray,
+    maximum: np.uint64,
+    initial_advances: int,
+) -> bool:
+    """Shuffle the first 128-bit words of a partially initialized state
+    one at a time and check the 64-bit rands against rands, exiting on mismatch
+
+    head -> init words 0..4 * words, modified in place
+    pos1 -> init words 488..488 + 4 * words
+    tail -> init words 616..623"""
+    prev_2 = tail[0:4]
+    prev_1 = tail[4:8]
+    rand_end = initial_advances + rands.shape[0]
+    for word in range((rand_end + 1) // 2):
+        i = word * 4
+        a_0 = head[i]
+        a_1 = head[i + 1]
+        a_2 = head[i + 2]
+        a_3 = head[i + 3]
+        head[i] = (
+            a_0
+            ^ np.uint32(a_0 << np.uint32(8))
+            ^ ((pos1[i] >> np.uint32(11)) & SFMT_MASK[0])
+            ^ np.uint32(prev_2[1] << np.uint32(24))
+            ^ (prev_2[0] >> np.uint32(8))
+            ^ np.uint32(prev_1[0] << np.uint32(18))
+        )
+        head[i + 1] = (
+            a_1
+            ^ np.uint32(a_1 << np.uint32(8))
+            ^ (a_0 >> np.uint32(24))
+            ^ ((pos1[i + 1] >> np.uint32(11)) & SFMT_MASK[1])
+            ^ np.uint32(prev_2[2] << np.uint32(24))
+            ^ (prev_2[1] >> np.uint32(8))
+            ^ np.uint32(prev_1[1] << np.uint32(18))
+        )
+        head[i + 2] = (
+            a_2
+            ^ np.uint32(a_2 << np.uint32(8))
+            ^ (a_1 >> np.uint32(24))
+            ^ ((pos1[i + 2] >> np.uint32(11)) & SFMT_MASK[2])
+            ^ np.uint32(prev_2[3] << np.uint32(24))
+            ^ (prev_2[2] >> np.uint32(8))
+            ^ np.uint32(prev_1[2] << np.uint32(18))
+        )
+        head[i + 3] = (
+            a_3
+            ^ np.uint32(a_3 << np.uint32(8))
+            ^ (a_2 >> np.uint32(24))
+            ^ ((pos1[i + 3] >> np.uint32(11)) & SFMT_MASK[3])
+            ^ (prev_2[3] >> np.uint32(8))
+            ^ np.uint32(prev_1[3] << np.uint32(18))
+        )
+        prev_2 = prev_1
+        prev_1 = head[i : i + 4]
+        for advance in range(
+            max(word * 2, initial_advances), min(word * 2 + 2, rand_end)
+        ):
+            rand = np.uint64(head[advance * 2]) | (
+                np.uint64(head[advance * 2 + 1]) << np.uint64(32)
+            )
+            if rand % np.uint64(maximum) != rands[advance - initial_advances]:
+                return False
+    return True
+
+
+@optional_njit(parallel=True)
+def search_sfmt_chunks(
+    rands: np.ndarray,
+    maximum: np.uint64,
+    initial_advances: int,
+    seed_start: np.uint64,
+    seed_count: np.uint64,
+    chunk_size: int,
+    buffer_size: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Search seed_count seeds from seed_start split into chunks of chunk_size seeds
+    for ones whose SFMT next_rand(maximum) sequence after initial_advances is rands
+    and return the (chunk_count, buffer_size) hits and per-chunk hit counts
+
+    Hits past buffer_size are counted but not stored
+    """
+    words = (initial_advances + rands.shape[0] + 1) // 2
+    chunk_count = (np.int64(seed_count) + chunk_size - 1) // chunk_size
+    hits = np.empty((chunk_count, buffer_size), np.uint32)
+    hit_counts = np.zeros(chunk_count, np.uint64)
+    for chunk in optional_prange(chunk_count):
+        heads = np.empty((words * 4, LANES), np.uint32)
+        pos1s = np.empty((words * 4, LANES), np.uint32)
+        tails = np.empty((8, LANES), np.uint32)
+        seeds = np.empty(LANES, np.uint32)
+        head = np.empty(words * 4, np.uint32)
+        pos1 = np.empty(words * 4, np.uint32)
+        tail = np.empty(8, np.uint32)
+        hit_count = 0
+        chunk_start = np.int64(chunk) * chunk_size
+        chunk_end = min(chunk_start + chunk_size, np.int64(seed_count))
+        for batch_start in range(chunk_start, chunk_end, LANES):
+            for lane in range(LANES):
+                seeds[lane] = np.uint32(
+                    np.uint64(seed_start) + np.uint64(batch_start + lane)
+                )
+            # run the init recurrence for every lane keeping only the needed words
+            for lane in range(LANES):
+                heads[0, lane] = seeds[lane]
+            for i in range(1, 624):
+                increment = np.uint32(i)
+                # a loop bound only known at runtime keeps LLVM from unrolling
+                # the lanes into scalar multiplications instead of vectorizing
+                for lane in range(seeds.shape[0]):
+                    seed = seeds[lane]
+                    seeds[lane] = (
+                        np.uint32(
+                            np.uint32(0x6C078965)
+                            * np.uint32(seed ^ (seed >> np.uint32(30)))
+                        )
+                        + increment
+                    )
+                if i < words * 4:
+                    heads[i] = seeds
+                elif 488 <= i < 488 + words * 4:
+                    pos1s[i - 488] = seeds
+                # the last POS1 words can also be tail words
+                if i >= 616:
+                    tails[i - 616] = seeds
+            for lane in range(min(LANES, chunk_end - batch_start)):
+                head[:] = heads[:, lane]
+                pos1[:] = pos1s[:, lane]
+                tail[:] = tails[:, lane]
+                # period certification
+                inner = (head[0] & np.uint32(1)) ^ (head[3] & np.uint32(0x13C9E684))
+                inner ^= inner >> np.uint32(16)
+                inner ^= inner >> np.uint32(8)
+                inner ^= inner >> np.uint32(4)
+                inner ^= inner >> np.uint32(2)
+                inner ^= inner >> np.uint32(1)
+                head[0] ^= ~inner & np.uint32(1)
+                if sfmt_prefix_matches(
+                    head, pos1, tail, rands, maximum, initial_advances
+                ):
+                    if hit_count < buffer_size:
+                        hits[chunk, hit_count] = heads[0, lane]
+                    hit_count += 1
+        hit_counts[chunk] = hit_count
+    return hits, hit_counts
+
+
+def search_sfmt_seeds(
+    rands: Sequence[int],
+    maximum: int,
+    *,
+    initial_advances: int = 0,
+    seed_start: int = 0,
+    seed_count: int = 0x100000000,
+    chunk_size: int = 0x10000,
+    chunks_per_batch: int = 0x100,
+    buffer_size: int = 0x10,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Find every SFMT19937 seed in [seed_start, seed_start + seed_count) whose
+    next_rand(maximum) calls after initial_advances advances produce rands
+    (e.g. Gen 7 clock needles with maximum 17)
+
+    Only the state words feeding the first initial_advances + len(rands) <= 68 rands
+    are kept and shuffled, and a seed is dropped at its first mismatching rand.
+    Chunks of chunk_size seeds run in parallel, chunks_per_batch at a time;
+    progress(seeds_done, seed_count) is called after every batch
+    """
+    rands = np.array(rands, dtype=np.uint64)
+    assert (
+        initial_advances + rands.shape[0] <= MAX_WORDS * 2
+    ), f"Only the first {MAX_WORDS * 2} rands can be searched"
+    chunk_size = -(-chunk_size // LANES) * LANES
+
+    def run_chunks(
+        start: int, batch_count: int, batch_buffer_size: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return search_sfmt_chunks(
+            rands,
+            maximum,
+            initial_advances,
+            seed_start + start,
+            batch_count,
+            chunk_size,
+            batch_buffer_size,
+        )
+
+    return search_chunks(
+        run_chunks,
+        seed_count,
+        chunk_size=chunk_size,
+        chunks_per_batch=chunks_per_batch,
+        buffer_size=buffer_size,
+        progress=progress,
+    )
@@ -1,11 +1,80 @@
 """Tiny Mersenne Twister Pseudo Random Number Generator"""
 
 from __future__ import annotations
+from typing import Optional
 import numpy as np
-from ..compilation import optional_jitclass, array_type
+from ..compilation import optional_jitclass, optional_njit, array_type
+from ..gf2 import solve_rows, observed_bits
+
+# characteristic polynomial of shuffle() for mat1 = 0x8F7011EE, mat2 = 0xFC78FF1F
+CHARACTERISTIC_POLYNOMIAL_HIGH = np.uint64(0xD8524022ED8DFF4A)
+CHARACTERISTIC_POLYNOMIAL_LOW = np.uint64(0x8DCC50C798FABA43)
+# advances past which jumping is cheaper than shuffling one at a time
+JUMP_THRESHOLD = 0x4000
+
+
+@optional_njit()
+def tinymt_shuffle(state: np.ndarray) -> None:
+    """Advance a TinyMT state array by 1"""
+    y_val = state[3]
+    x_val = (state[0] & np.uint32(0x7FFFFFFF)) ^ state[1] ^ state[2]
+
+    x_val ^= x_val << np.uint32(1)
+    y_val ^= (y_val >> np.uint32(1)) ^ x_val
+
+    state[0] = state[1]
+    state[1] = state[2] ^ ((y_val & np.uint32(1)) * np.uint32(0x8F7011EE))
+    state[2] = x_val ^ (y_val << np.uint32(10)) ^ ((y_val & 1) * np.uint32(0xFC78FF1F))
+    state[3] = y_val
+
+
+@optional_njit()
+def jump_polynomial(adv: np.uint64) -> tuple[np.uint64, np.uint64]:
+    """Compute t^adv mod the characteristic polynomial as (high, low) 64-bit halves"""
+    adv = np.uint64(adv)
+    one = np.uint64(1)
+    high = np.uint64(0)
+    low = np.uint64(1)
+    for bit in range(63, -1, -1):
+        # square by multiplying (high, low) with itself one bit at a time
+        square_high = np.uint64(0)
+        square_low = np.uint64(0)
+        for i in range(126, -1, -1):
+            # reduce by the characteristic polynomial when t^127 is reached
+            carry = square_high >> np.uint64(62) & one
+            square_high = (square_high << one) | (square_low >> np.uint64(63))
+            square_low <<= one
+            if carry:
+                square_high ^= CHARACTERISTIC_POLYNOMIAL_HIGH
+                square_low ^= CHARACTERISTIC_POLYNOMIAL_LOW
+            if (high if i >= 64 else low) >> np.uint64(i & 63) & one:
+                square_high ^= high
+                square_low ^= low
+        high, low = square_high, square_low
+        if adv >> np.uint64(bit) & one:
+            # multiply by t
+            carry = high >> np.uint64(62) & one
+            high = (high << one) | (low >> np.uint64(63))
+            low <<= one
+            if carry:
+                high ^= CHARACTERISTIC_POLYNOMIAL_HIGH
+                low ^= CHARACTERISTIC_POLYNOMIAL_LOW
+    return high, low
+
+
+@optional_njit()
+def tinymt_jump(state: np.ndarray, adv: np.uint64) -> None:
+    """Jump a TinyMT state array ahead by adv"""
+    high, low = jump_polynomial(adv)
+    # evaluate the jump polynomial at shuffle() via Horner's method
+    result = np.zeros(4, dtype=np.uint32)
+    for i in range(126, -1, -1):
+        tinymt_shuffle(result)
+        if (high if i >= 64 else low) >> np.uint64(i & 63) & np.uint64(1):
+            result ^= state
+    state[:] = result
 
 
-# TODO: jump tables
 # TODO: staticmethod const functions
 # TODO: reverse next
 @optional_jitclass
@@ -49,9 +118,16 @@ class TinyMersenneTwister:
 
     def advance(self, adv: np.uint32) -> None:
         """Advance Tiny Mersenne Twister sequence by adv"""
+        if adv >= JUMP_THRESHOLD:
+            self.jump(adv)
+            return
         for _ in range(adv):
             self.shuffle()
 
+    def jump(self, adv: np.uint64) -> None:
+        """Jump ahead by adv in O(127^2) bit operations per bit of adv"""
+        tinymt_jump(self.state, adv)
+
     def next(self) -> np.uint32:
         """Advance and return the next 32-bit tempered rand"""
         self.shuffle()
@@ -59,27 +135,16 @@ class TinyMersenneTwister:
 
     def shuffle(self) -> None:
         """Advance the state by 1"""
-        y_val = self.state[3]
-        x_val = (self.state[0] & np.uint32(0x7FFFFFFF)) ^ self.state[1] ^ self.state[2]
-
-        x_val ^= x_val << np.uint32(1)
-        y_val ^= (y_val >> np.uint32(1)) ^ x_val
-
-        self.state[0] = self.state[1]
-        self.state[1] = self.state[2] ^ ((y_val & np.uint32(1)) * np.uint32(0x8F7011EE))
-        self.state[2] = (
-            x_val ^ (y_val << np.uint32(10)) ^ ((y_val & 1) * np.uint32(0xFC78FF1F))
-        )
-        self.state[3] = y_val
+        tinymt_shuffle(self.state)
 
     def temper(self) -> np.uint32:
         """Access and return the next 32-bit tempered rand"""
         temper_0 = self.state[3]
-        temper_1 = self.state[0] + (self.state[2] >> np.uint32(8))
+        temper_1 = np.uint32(self.state[0] + (self.state[2] >> np.uint32(8)))
 
         temper_0 ^= temper_1
 
-        return temper_0 ^ ((temper_1 & 1) * np.uint32(0x3793FDFF))
+        return np.uint32(temper_0 ^ ((temper_1 & 1) * np.uint32(0x3793FDFF)))
 
     def next_rand(self, maximum: np.uint32) -> np.uint32:
         """Generate and return the next [0, maximum) random uint
@@ -89,3 +154,240 @@ class TinyMersenneTwister:
     def next_rand_mod(self, maximum: np.uint32) -> np.uint32:
         """Generate and return the next [0, maximum) random uint via modulo distribution"""
         return self.next() % np.uint32(maximum)
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit tempered rands"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints
+        via multiplication-shift distribution"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
+    def fill_rand_mod(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints
+        via modulo distribution"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand_mod(maximum)
+        return out
+
+
+@optional_jitclass
+class TinyMersenneTwisterBatch:
+    """Tiny Mersenne Twister run in lockstep over a batch of seeds
+
+    The state is stored word-major as (4, seed_count) so every step of the
+    recurrence is a contiguous vector operation across seeds"""
+
+    state: array_type(np.uint32, 2)  # contiguous array
+
+    def __init__(self, seeds: np.ndarray) -> None:
+        self.state = np.empty((4, seeds.shape[0]), dtype=np.uint32)
+        self.re_init(seeds)
+
+    def re_init(self, seeds: np.ndarray) -> None:
+        """Reinitialize every lane without creating a new object"""
+        state = self.state  # accessing self.state directly fails to vectorize
+        for lane in range(state.shape[1]):
+            state[0, lane] = np.uint32(seeds[lane])
+            state[1, lane] = 0x8F7011EE
+            state[2, lane] = 0xFC78FF1F
+            state[3, lane] = 0x3793FDFF
+        for i in range(8):
+            for lane in range(state.shape[1]):
+                previous = state[(i - 1) & 3, lane]
+                state[i & 3, lane] ^= np.uint32(
+                    np.uint32(
+                        np.uint32(0x6C078965) * (previous ^ (previous >> np.uint32(30)))
+                    )
+                    + np.uint32(i)
+                )
+
+        for lane in range(state.shape[1]):
+            if (
+                state[0, lane] & np.uint32(0x7FFFFFFF) == np.uint32(0)
+                and state[1, lane] == np.uint32(0)
+                and state[2, lane] == np.uint32(0)
+                and state[3, lane] == np.uint32(0)
+            ):
+                state[0, lane] = ord("T")
+                state[1, lane] = ord("I")
+                state[2, lane] = ord("N")
+                state[3, lane] = ord("Y")
+
+        for _ in range(8):
+            self.shuffle()
+
+    def advance(self, adv: np.uint32) -> None:
+        """Advance every lane by adv"""
+        if adv >= JUMP_THRESHOLD:
+            lane_state = np.empty(4, dtype=np.uint32)
+            for lane in range(self.state.shape[1]):
+                lane_state[:] = self.state[:, lane]
+                tinymt_jump(lane_state, adv)
+                self.state[:, lane] = lane_state
+            return
+        for _ in range(adv):
+            self.shuffle()
+
+    def next(self) -> np.ndarray:
+        """Advance and return the next 32-bit tempered rand of every lane"""
+        return self.next_into(np.empty(self.state.shape[1], dtype=np.uint32))
+
+    def next_into(self, out: np.ndarray) -> np.ndarray:
+        """Advance and write the next 32-bit tempered rand of every lane to out"""
+        self.shuffle()
+        return self.temper_into(out)
+
+    def shuffle(self) -> None:
+        """Advance the state of every lane by 1"""
+        state = self.state  # accessing self.state directly fails to vectorize
+        for lane in range(state.shape[1]):
+            y_val = state[3, lane]
+            x_val = (state[0, lane] & np.uint32(0x7FFFFFFF)) ^ state[1, lane]
+            x_val ^= state[2, lane]
+
+            x_val ^= x_val << np.uint32(1)
+            y_val ^= (y_val >> np.uint32(1)) ^ x_val
+
+            state[0, lane] = state[1, lane]
+            state[1, lane] = state[2, lane] ^ np.uint32(
+                (y_val & np.uint32(1)) * np.uint32(0x8F7011EE)
+            )
+            state[2, lane] = (
+                x_val
+                ^ np.uint32(y_val << np.uint32(10))
+                ^ np.uint32((y_val & np.uint32(1)) * np.uint32(0xFC78FF1F))
+            )
+            state[3, lane] = y_val
+
+    def temper_into(self, out: np.ndarray) -> np.ndarray:
+        """Write the current 32-bit tempered rand of every lane to out"""
+        state = self.state
+        for lane in range(state.shape[1]):
+            temper_1 = np.uint32(state[0, lane] + (state[2, lane] >> np.uint32(8)))
+            out[lane] = (state[3, lane] ^ temper_1) ^ np.uint32(
+                (temper_1 & np.uint32(1)) * np.uint32(0x3793FDFF)
+            )
+        return out
+
+    def next_rand(self, maximum: np.uint32) -> np.ndarray:
+        """Generate and return the next [0, maximum) random uint of every lane
+        via multiplication-shift distribution"""
+        rands = self.next()
+        for lane in range(rands.shape[0]):
+            rands[lane] = np.uint32(
+                (np.uint64(rands[lane]) * np.uint64(maximum)) >> np.uint64(32)
+            )
+        return rands
+
+    def next_rand_mod(self, maximum: np.uint32) -> np.ndarray:
+        """Generate and return the next [0, maximum) random uint of every lane
+        via modulo distribution"""
+        rands = self.next()
+        for lane in range(rands.shape[0]):
+            rands[lane] = rands[lane] % np.uint32(maximum)
+        return rands
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit tempered rands of every lane
+        as a (count, seed_count) array"""
+        for i in range(out.shape[0]):
+            self.next_into(out[i])
+        return out
+
+
+@optional_njit()
+def low_bit_rows(advances: np.ndarray, initial_shuffles: np.uint64) -> np.ndarray:
+    """Bit-packed rows of the linear map from the 128 bits of a state to the low bits
+    of the next() calls made after initial_shuffles + advances[i] shuffles of it
+
+    Only the low bit of a tempered rand is linear as temper() adds state words"""
+    rows = np.zeros((advances.shape[0], 2), dtype=np.uint64)
+    state = np.empty(4, dtype=np.uint32)
+    for column in range(128):
+        state[:] = 0
+        state[column >> 5] = np.uint32(1) << np.uint32(column & 31)
+        # shuffle once first as jumping is only valid for states in the image of shuffle()
+        tinymt_shuffle(state)
+        position = np.uint64(1)
+        for i in range(advances.shape[0]):
+            target = np.uint64(initial_shuffles) + np.uint64(advances[i]) + np.uint64(1)
+            if target - position >= JUMP_THRESHOLD:
+                tinymt_jump(state, target - position)
+            else:
+                for _ in range(target - position):
+                    tinymt_shuffle(state)
+            position = target
+            if state[3] & np.uint32(1):
+                rows[i, column >> 6] |= np.uint64(1) << np.uint64(column & 63)
+    return rows
+
+
+def solve_low_bits(
+    bits: np.ndarray, advances: Optional[np.ndarray], initial_shuffles: int
+) -> Optional[np.ndarray]:
+    """Solve for the state whose next() calls after initial_shuffles + advances[i]
+    shuffles have the low bits bits, None if no state fits"""
+    bits, advances = observed_bits(bits, advances)
+    solution, nullspace, consistent = solve_rows(
+        low_bit_rows(advances, initial_shuffles), bits
+    )
+    # the top bit of state[0] never reaches the outputs
+    assert (
+        nullspace.shape[0] == 1
+    ), "127 independent bits are needed to recover the state"
+    if not consistent:
+        return None
+    return solution.view(np.uint32)
+
+
+def from_low_bits(
+    bits: np.ndarray, advances: Optional[np.ndarray] = None
+) -> Optional[TinyMersenneTwister]:
+    """Rebuild a TinyMersenneTwister from the low bits of its next() calls
+    (e.g. next_rand_mod with an even maximum) at advances (default consecutive),
+    positioned to return the first of them, None if no state fits
+
+    The unobservable top bit of state[0] is cleared"""
+    state = solve_low_bits(bits, advances, 0)
+    if state is None:
+        return None
+    rng = TinyMersenneTwister(0)
+    rng.state[:] = state
+    return rng
+
+
+def recover_seed(
+    bits: np.ndarray, advances: Optional[np.ndarray] = None, initial_advances: int = 0
+) -> Optional[np.uint32]:
+    """Recover the seed whose next() calls after initial_advances have the low bits
+    bits at advances (default consecutive), None if no seed fits"""
+    # solve for the state before re_init's 8 shuffles and invert its init loop
+    state = solve_low_bits(bits, advances, initial_advances + 8)
+    if state is None:
+        return None
+    for top_bit in (0, 0x80000000):
+        init_state = state.copy()
+        init_state[0] |= np.uint32(top_bit)
+        for i in range(7, -1, -1):
+            init_state[i & 3] ^= np.uint32(
+                np.uint32(0x6C078965)
+                * (init_state[(i - 1) & 3] ^ (init_state[(i - 1) & 3] >> np.uint32(30)))
+                + np.uint32(i)
+            )
+        if (
+            init_state[1] == np.uint32(0x8F7011EE)
+            and init_state[2] == np.uint32(0xFC78FF1F)
+            and init_state[3] == np.uint32(0x3793FDFF)
+        ):
+            return init_state[0]
+    return None
+
+
+TinyMersenneTwister.from_low_bits = from_low_bits
+TinyMersenneTwister.recover_seed = recover_seed
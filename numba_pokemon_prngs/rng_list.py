@@ -21,6 +21,9 @@ class RNGList(Protocol):
     def re_init(self):
         """Reinitialize without creating a new object"""
 
+    def refill(self) -> None:
+        """Regenerate the entire list from the current rng state"""
+
     def advance_states(self, adv: np.uint32) -> None:
         """Advance the state of the RNGList by adv"""
 
@@ -35,9 +38,24 @@ class RNGList(Protocol):
 
 
 def build_rnglist(
-    *, rng_class: PRNG, next_function_name: str, state_type: np.dtype, size: int
+    *,
+    rng_class: PRNG,
+    next_function_name: str,
+    state_type: np.dtype,
+    size: int,
+    next_function_args: tuple = (),
+    jump_function_name: str = None,
 ) -> Type[RNGList]:
-    """Build RNGList class for rng_class of size using next_function_name"""
+    """
+    Build RNGList class for rng_class of size caching
+    rng.next_function_name(*next_function_args) outputs as state_type
+
+    i.e. next_function_name="next_rand", next_function_args=(25,) caches next_rand(25)
+
+    jump_function_name optionally names an rng method that skips ahead by adv outputs
+    of next_function (i.e. "jump" for LCRNGs or "advance" for Mersenne Twisters)
+    which is used in place of generating outputs one by one when advancing past the list
+    """
     assert size != 0 and (
         (size & (size - 1)) == 0
     ), "Size is not a perfect multiple of two"
@@ -46,13 +64,20 @@ def build_rnglist(
             next_function_name
         ]
     else:
-        next_function: Callable[[PRNG], state_type] = rng_class.__dict__[
-            next_function_name
-        ]
+        next_function: Callable[[PRNG], state_type] = getattr(
+            rng_class, next_function_name
+        )
+    jump_function: Callable[[PRNG, np.uint32], None] = None
+    if jump_function_name is not None:
+        jump_function = (
+            rng_class.class_type.jit_methods[jump_function_name]
+            if USE_NUMBA
+            else getattr(rng_class, jump_function_name)
+        )
 
     @optional_jitclass(
         {
-            "list": array_type(np.uint32),  # contiguous array
+            "list": array_type(state_type),  # contiguous array
             "rng": rng_class.class_type.instance_type if USE_NUMBA else rng_class,
             "head": np.uint16,
             "pointer": np.uint16,
@@ -70,20 +95,42 @@ def build_rnglist(
 
         def re_init(self):
             """Reinitialize without creating a new object"""
+            self.refill()
+
+        def refill(self) -> None:
+            """Regenerate the entire list from the current rng state"""
             self.head = 0
             self.pointer = 0
             for i in range(size):
-                self.list[i] = next_function(self.rng)
+                self.list[i] = next_function(self.rng, *next_function_args)
 
         def advance_states(self, adv: np.uint32) -> None:
             """Advance the state of the RNGList by adv"""
             adv = np.uint32(adv)
-            for _ in range(adv):
-                self.advance_state()
+            if adv >= np.uint32(size):
+                # every cached value is replaced, so skip ahead and refill as a block
+                self.skip(adv - np.uint32(size))
+                self.refill()
+            else:
+                for _ in range(adv):
+                    self.advance_state()
+
+        if jump_function is None:
+
+            def skip(self, adv: np.uint32) -> None:
+                """Skip adv outputs of the rng without caching them"""
+                for _ in range(adv):
+                    next_function(self.rng, *next_function_args)
+
+        else:
+
+            def skip(self, adv: np.uint32) -> None:
+                """Skip adv outputs of the rng without caching them"""
+                jump_function(self.rng, adv)
 
         def advance_state(self) -> None:
             """Advance the state of the RNGList by one"""
-            self.list[self.head] = next_function(self.rng)
+            self.list[self.head] = next_function(self.rng, *next_function_args)
             self.head = (self.head + 1) & (size - 1)
 
             self.pointer = self.head
@@ -0,0 +1,61 @@
+"""Batched driver shared by the parallel chunked seed searches"""
+
+from __future__ import annotations
+from typing import Callable, Optional
+import numpy as np
+
+
+def search_chunks(
+    run_chunks: Callable[[int, int, int], tuple[np.ndarray, np.ndarray]],
+    count: int,
+    *,
+    chunk_size: int,
+    chunks_per_batch: int,
+    buffer_size: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Search count candidates chunks_per_batch chunks of chunk_size at a time
+    and return every uint32 hit in order
+
+    run_chunks(start, batch_count, buffer_size) searches the batch_count candidates
+    from start in chunks of chunk_size and returns the (chunk_count, buffer_size) hits
+    and per-chunk hit counts, hits past buffer_size being counted but not stored.
+    progress(candidates_done, count) is called after every batch
+    """
+    batch_size = chunk_size * chunks_per_batch
+
+    results = np.empty(buffer_size, np.uint32)
+    result_count = 0
+    done = 0
+    while done < count:
+        batch_count = min(batch_size, count - done)
+        hits, hit_counts = run_chunks(done, batch_count, buffer_size)
+        for chunk, hit_count in enumerate(hit_counts):
+            hit_count = int(hit_count)
+            if hit_count == 0:
+                continue
+            if hit_count > buffer_size:
+                # rerun overflowing chunks alone with a buffer large enough for every hit
+                chunk_hits, _ = run_chunks(
+                    done + chunk * chunk_size,
+                    min(chunk_size, batch_count - chunk * chunk_size),
+                    hit_count,
+                )
+                chunk_hits = chunk_hits[0]
+            else:
+                chunk_hits = hits[chunk, :hit_count]
+            if result_count + hit_count > results.shape[0]:
+                results = np.concatenate(
+                    (
+                        results,
+                        np.empty(max(results.shape[0], hit_count), np.uint32),
+                    )
+                )
+            results[result_count : result_count + hit_count] = chunk_hits
+            result_count += hit_count
+        done += batch_count
+        if progress is not None:
+            progress(done, count)
+
+    return results[:result_count]
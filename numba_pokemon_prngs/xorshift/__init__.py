@@ -2,3 +2,4 @@
 
 from .xorshift128 import Xorshift128
 from .xoroshiro128plus import Xoroshiro128PlusRejection, SplitMixXoroshiro128Plus
+from .player_blink import recover_from_blinks, verify_blinks, reidentify_blinks
@@ -0,0 +1,141 @@
+"""BDSP Xorshift128 state recovery from the intervals between player blinks
+
+The player blinks on an advance whose rand has every bit of mask clear,
+so each blink pins popcount(mask) bits of an output that is linear in the state.
+Intervals are the advances between consecutive blinks, the state being
+positioned so that next() returns the rand of the first blink"""
+
+from __future__ import annotations
+import numpy as np
+from ..compilation import optional_njit
+from ..gf2 import basis_evolutions, solve_rows, enumerate_solutions, pack_bits
+from .xorshift128 import Xorshift128, JUMP_MATRICES, JUMP_THRESHOLD, step_states
+
+
+def blink_advances(intervals: np.ndarray) -> np.ndarray:
+    """Advances of every blink relative to the first"""
+    advances = np.zeros(len(intervals) + 1, dtype=np.uint64)
+    advances[1:] = np.cumsum(np.asarray(intervals, dtype=np.uint64))
+    return advances
+
+
+def blink_rows(advances: np.ndarray, mask: np.uint32) -> np.ndarray:
+    """Packed rows of the linear map from the 128 bits of a state to the bits of mask
+    of the next() calls made after advances[i] advances of it"""
+    mask_bits = tuple(bit for bit in range(32) if (int(mask) >> bit) & 1)
+    rows = np.empty((advances.shape[0] * len(mask_bits), 2), dtype=np.uint64)
+    # the rand of next() is state[3] after stepping
+    for i, states in enumerate(
+        basis_evolutions(
+            advances + np.uint64(1),
+            lambda states: step_states(states.view(np.uint32)),
+            JUMP_MATRICES,
+            JUMP_THRESHOLD,
+        )
+    ):
+        for j, bit in enumerate(mask_bits):
+            rows[i * len(mask_bits) + j] = pack_bits(
+                (states[:, 1] >> np.uint64(32 + bit)) & np.uint64(1)
+            )
+    return rows
+
+
+@optional_njit()
+def blinks_match(state: np.ndarray, intervals: np.ndarray, mask: np.uint32) -> bool:
+    """Check that next() calls from a uint32 state blink exactly at uint64 intervals"""
+    mask = np.uint32(mask)
+    rng = Xorshift128(state[0], state[1], state[2], state[3])
+    next_blink = 0
+    blink = 0
+    for advance in range(np.int64(np.sum(intervals)) + 1):
+        if ((rng.next() & mask) == 0) != (advance == next_blink):
+            return False
+        if advance == next_blink and blink < intervals.shape[0]:
+            next_blink += np.int64(intervals[blink])
+            blink += 1
+    return True
+
+
+def verify_blinks(
+    state: np.ndarray, intervals: np.ndarray, mask: np.uint32 = 0xF
+) -> bool:
+    """Check that next() calls from state blink exactly at the intervals"""
+    return blinks_match(
+        np.asarray(state, dtype=np.uint32),
+        np.asarray(intervals, dtype=np.uint64),
+        mask,
+    )
+
+
+def recover_from_blinks(
+    intervals: np.ndarray, mask: np.uint32 = 0xF, max_states: int = 0x10000
+) -> np.ndarray:
+    """Every Xorshift128 state that blinks exactly at intervals
+    as a (count, 4) uint32 array
+
+    Fewer than 128 independent blink bits leave 2^(128 - rank) candidates to verify,
+    which must not exceed max_states"""
+    intervals = np.asarray(intervals, dtype=np.uint64)
+    advances = blink_advances(intervals)
+    rows = blink_rows(advances, mask)
+    solution, nullspace, consistent = solve_rows(
+        rows, np.zeros(rows.shape[0], dtype=np.uint8)
+    )
+    if not consistent:
+        return np.empty((0, 4), dtype=np.uint32)
+    assert (
+        1 << nullspace.shape[0] <= max_states
+    ), f"{1 << nullspace.shape[0]} states fit the blinks, more than {max_states}"
+    states = enumerate_solutions(solution, nullspace).view(np.uint32)
+    verified = np.array(
+        [blinks_match(state, intervals, mask) for state in states], dtype=bool
+    )
+    return states[verified]
+
+
+@optional_njit()
+def blink_starts(
+    state: np.ndarray, intervals: np.ndarray, max_advances: int, mask: np.uint32
+) -> np.ndarray:
+    """Advances in [0, max_advances] from a uint32 state
+    after which next() calls blink exactly at uint64 intervals"""
+    mask = np.uint32(mask)
+    span = np.int64(np.sum(intervals))
+    # blinks[i] -> whether the next() call after i advances blinks
+    blinks = np.empty(max_advances + span + 1, dtype=np.bool_)
+    rng = Xorshift128(state[0], state[1], state[2], state[3])
+    for i in range(blinks.shape[0]):
+        blinks[i] = (rng.next() & mask) == 0
+    hits = np.empty(max_advances + 1, dtype=np.uint64)
+    hit_count = 0
+    for start in range(max_advances + 1):
+        if not blinks[start]:
+            continue
+        position = start
+        matches = True
+        for interval in intervals:
+            for i in range(position + 1, position + np.int64(interval)):
+                if blinks[i]:
+                    matches = False
+                    break
+            position += np.int64(interval)
+            if not matches or not blinks[position]:
+                matches = False
+                break
+        if matches:
+            hits[hit_count] = start
+            hit_count += 1
+    return hits[:hit_count]
+
+
+def reidentify_blinks(
+    state: np.ndarray, intervals: np.ndarray, max_advances: int, mask: np.uint32 = 0xF
+) -> np.ndarray:
+    """Advances in [0, max_advances] from a previously identified state
+    after which next() calls blink exactly at intervals"""
+    return blink_starts(
+        np.asarray(state, dtype=np.uint32),
+        np.asarray(intervals, dtype=np.uint64),
+        max_advances,
+        mask,
+    )
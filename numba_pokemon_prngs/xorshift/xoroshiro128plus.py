@@ -1,13 +1,56 @@
 """Xoroshiro128+ Pseudo Random Number Generator"""
 
 from __future__ import annotations
+from typing import Callable, Optional
 import numpy as np
 from ..util import rotate_left_u64, rotate_right_u64
-from ..compilation import optional_jitclass, array_type
+from ..compilation import (
+    optional_jitclass,
+    optional_njit,
+    optional_prange,
+    array_type,
+    memoized_const_function,
+)
+from ..gf2 import (
+    basis_states,
+    basis_evolutions,
+    matrix_powers,
+    apply_matrix_powers,
+    solve_rows,
+    enumerate_solutions,
+    observed_bits,
+    pack_bits,
+)
+
+# jump polynomials of the reference xoroshiro128+ jump() and long_jump()
+JUMP_2_64 = (np.uint64(0xDF900294D8F554A5), np.uint64(0x170865DF4B3201FC))
+JUMP_2_96 = (np.uint64(0xD2A98B26625EEE7B), np.uint64(0xDDDF9B1090AA7AC1))
+# advances past which jumping is cheaper than stepping one at a time
+JUMP_THRESHOLD = 0x1000
+
+
+def step_states(states: np.ndarray) -> np.ndarray:
+    """Advance a (count, 2) array of states by 1 in place"""
+    seed_0 = states[:, 0].copy()
+    seed_1 = states[:, 1] ^ seed_0
+    states[:, 0] = (
+        ((seed_0 << np.uint64(24)) | (seed_0 >> np.uint64(40)))
+        ^ seed_1
+        ^ (seed_1 << np.uint64(16))
+    )
+    states[:, 1] = (seed_1 << np.uint64(37)) | (seed_1 >> np.uint64(27))
+    return states
+
+
+def step_matrix() -> np.ndarray:
+    """Columns of the GF(2) matrix of one state transition"""
+    return step_states(basis_states())
+
+
+# step^(2^k) for every bit of a 64-bit advance
+JUMP_MATRICES = matrix_powers(step_matrix(), 64)
 
 
-# TODO: jump tables
-# TODO: staticmethod const functions
 class Xoroshiro128Plus:
     """Xoroshiro128+ Pseudo Random Number Generator Parent Class"""
 
@@ -22,9 +65,39 @@ class Xoroshiro128Plus:
 
     def advance(self, adv: np.uint64) -> None:
         """Advance Xoroshiro128+ sequence by adv"""
+        if adv >= JUMP_THRESHOLD:
+            self.jump(adv)
+            return
         for _ in range(adv):
             self.next()
 
+    def jump(self, adv: np.uint64) -> None:
+        """Jump ahead by adv via precomputed GF(2) matrix powers"""
+        apply_matrix_powers(JUMP_MATRICES, self.state, adv)
+
+    def polynomial_jump(self, polynomial_0: np.uint64, polynomial_1: np.uint64) -> None:
+        """Jump ahead by evaluating a jump polynomial at next()"""
+        seed_0 = np.uint64(0)
+        seed_1 = np.uint64(0)
+        for polynomial in (np.uint64(polynomial_0), np.uint64(polynomial_1)):
+            for bit in range(64):
+                if (polynomial >> np.uint64(bit)) & np.uint64(1):
+                    seed_0 ^= self.state[0]
+                    seed_1 ^= self.state[1]
+                self.next()
+        self.state[0] = seed_0
+        self.state[1] = seed_1
+
+    def jump_2_64(self) -> None:
+        """Jump ahead by 2^64, equivalent to 2^64 calls to next()
+        (reference xoroshiro128+ jump() for splitting into sub-streams)"""
+        self.polynomial_jump(JUMP_2_64[0], JUMP_2_64[1])
+
+    def jump_2_96(self) -> None:
+        """Jump ahead by 2^96, equivalent to 2^32 calls to jump_2_64()
+        (reference xoroshiro128+ long_jump())"""
+        self.polynomial_jump(JUMP_2_96[0], JUMP_2_96[1])
+
     def next(self) -> np.uint64 | np.uint32:
         """Advance and return the next random uint"""
         raise NotImplementedError()
@@ -37,6 +110,25 @@ class Xoroshiro128Plus:
         """Generate and return the next [0, maximum) random uint"""
         raise NotImplementedError()
 
+    @staticmethod
+    def const_rand(
+        maximum: np.uint32, **kwargs
+    ) -> Callable[[Xoroshiro128Plus], np.uint32]:
+        """Compile @njit rand function with a const maximum"""
+        raise NotImplementedError()
+
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
 
 @optional_jitclass
 class Xoroshiro128PlusRejection(Xoroshiro128Plus):
@@ -87,6 +179,31 @@ class Xoroshiro128PlusRejection(Xoroshiro128Plus):
             result = self.next() & mask
         return result
 
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        maximum = np.uint64(maximum)
+        # the mask is computed once for the whole fill rather than per rand
+        mask = np.uint64(self.bit_mask(maximum))
+        for i in range(out.shape[0]):
+            result = self.next() & mask
+            while result >= maximum:
+                result = self.next() & mask
+            out[i] = result
+        return out
+
+    def rewind_to_seed(self, max_advances: np.uint64) -> np.int64:
+        """Step backwards with previous() until state[1] is the default seed_1,
+        returning the advances rewound or -1 (restoring the state)
+        if it is not reached within max_advances"""
+        seed_0 = self.state[0]
+        seed_1 = self.state[1]
+        for advances in range(np.int64(max_advances) + 1):
+            if self.state[1] == np.uint64(0x82A2B175229D6A5B):
+                return advances
+            self.previous()
+        self.state[0] = seed_0
+        self.state[1] = seed_1
+        return -1
+
     @staticmethod
     def bit_mask(val: np.uint32) -> np.uint32:
         """Create a bitmask that includes only up to the MSB of val"""
@@ -100,6 +217,36 @@ class Xoroshiro128PlusRejection(Xoroshiro128Plus):
         return val
 
 
+@optional_njit()
+def splitmix(seed: np.uint64, state: np.uint64) -> np.uint64:
+    """Splitmix initialization function"""
+    seed = np.uint64(seed)
+    state = np.uint64(state)
+
+    seed += state
+    seed = np.uint64(0xBF58476D1CE4E5B9) * (seed ^ (seed >> np.uint64(30)))
+    seed = np.uint64(0x94D049BB133111EB) * (seed ^ (seed >> np.uint64(27)))
+
+    return np.uint64(seed ^ (seed >> np.uint64(31)))
+
+
+@optional_njit()
+def unsplitmix(value: np.uint64, state: np.uint64) -> np.uint64:
+    """Inverse of splitmix, recovering seed from splitmix(seed, state)"""
+    value = np.uint64(value)
+    state = np.uint64(state)
+
+    value ^= (value >> np.uint64(31)) ^ (value >> np.uint64(62))
+    # 0x94D049BB133111EB^-1 mod 2^64
+    value = np.uint64(0x319642B2D24D8EC3) * value
+    value ^= (value >> np.uint64(27)) ^ (value >> np.uint64(54))
+    # 0xBF58476D1CE4E5B9^-1 mod 2^64
+    value = np.uint64(0x96DE1B173F119089) * value
+    value ^= (value >> np.uint64(30)) ^ (value >> np.uint64(60))
+
+    return np.uint64(value - state)
+
+
 @optional_jitclass
 class SplitMixXoroshiro128Plus(Xoroshiro128Plus):
     """Xoroshiro128+ Pseudo Random Number Generator w/splitmix initialization"""
@@ -120,14 +267,12 @@ class SplitMixXoroshiro128Plus(Xoroshiro128Plus):
     @staticmethod
     def splitmix(seed: np.uint64, state: np.uint64) -> np.uint64:
         """Splitmix initialization function"""
-        seed = np.uint64(seed)
-        state = np.uint64(state)
+        return splitmix(seed, state)
 
-        seed += state
-        seed = np.uint64(0xBF58476D1CE4E5B9) * (seed ^ (seed >> np.uint64(30)))
-        seed = np.uint64(0x94D049BB133111EB) * (seed ^ (seed >> np.uint64(27)))
-
-        return np.uint64(seed ^ (seed >> np.uint64(31)))
+    @staticmethod
+    def unsplitmix(value: np.uint64, state: np.uint64) -> np.uint64:
+        """Inverse of splitmix, recovering seed from splitmix(seed, state)"""
+        return unsplitmix(value, state)
 
     def next(self) -> np.uint32:
         seed_0 = self.state[0]
@@ -154,3 +299,115 @@ class SplitMixXoroshiro128Plus(Xoroshiro128Plus):
 
     def next_rand(self, maximum: np.uint32) -> np.uint32:
         return self.next() % maximum
+
+
+def const_rand_rejection(
+    maximum: np.uint32, **kwargs
+) -> Callable[[Xoroshiro128PlusRejection], np.uint64]:
+    """Compile @njit Xoroshiro128PlusRejection.next_rand with a const maximum
+    and its bit mask folded in"""
+    maximum = np.uint64(maximum)
+    mask = np.uint64(Xoroshiro128PlusRejection.bit_mask(maximum))
+
+    if mask == maximum - np.uint64(1):
+        # power of 2 maximums never reject
+
+        @optional_njit(**kwargs)
+        def rand_func(self: Xoroshiro128PlusRejection) -> np.uint64:
+            return self.next() & mask
+
+        return rand_func
+
+    @optional_njit(**kwargs)
+    def rand_func(self: Xoroshiro128PlusRejection) -> np.uint64:
+        result = self.next() & mask
+        while result >= maximum:
+            result = self.next() & mask
+        return result
+
+    return rand_func
+
+
+def const_rand_splitmix(
+    maximum: np.uint32, **kwargs
+) -> Callable[[SplitMixXoroshiro128Plus], np.uint32]:
+    """Compile @njit SplitMixXoroshiro128Plus.next_rand with a const maximum"""
+    maximum = np.uint32(maximum)
+
+    @optional_njit(**kwargs)
+    def rand_func(self: SplitMixXoroshiro128Plus) -> np.uint32:
+        return self.next() % maximum
+
+    return rand_func
+
+
+@optional_njit()
+def splitmix_seed(state_0: np.uint64, state_1: np.uint64) -> tuple[np.uint64, bool]:
+    """Recover the seed SplitMixXoroshiro128Plus.re_init was called with to produce
+    (state_0, state_1) and whether state_1 matches it"""
+    seed = unsplitmix(state_0, np.uint64(0x9E3779B97F4A7C15))
+    return seed, splitmix(seed, np.uint64(0x3C6EF372FE94F82A)) == np.uint64(state_1)
+
+
+def from_state(state: np.ndarray) -> Optional[np.uint64]:
+    """Recover the seed of a freshly initialized SplitMixXoroshiro128Plus state,
+    None if the state was not produced by re_init"""
+    seed, valid = splitmix_seed(state[0], state[1])
+    return seed if valid else None
+
+
+@optional_njit(parallel=True)
+def from_states(states: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Recover the seeds of a (count, 2) array of freshly initialized
+    SplitMixXoroshiro128Plus states and whether each was produced by re_init"""
+    seeds = np.empty(states.shape[0], dtype=np.uint64)
+    valid = np.empty(states.shape[0], dtype=np.bool_)
+    for i in optional_prange(states.shape[0]):
+        seeds[i], valid[i] = splitmix_seed(states[i, 0], states[i, 1])
+    return seeds, valid
+
+
+Xoroshiro128PlusRejection.const_rand = memoized_const_function(
+    Xoroshiro128PlusRejection, const_rand_rejection
+)
+SplitMixXoroshiro128Plus.const_rand = memoized_const_function(
+    SplitMixXoroshiro128Plus, const_rand_splitmix
+)
+
+
+def low_bit_rows(advances: np.ndarray) -> np.ndarray:
+    """Packed rows of the linear map from the 128 bits of a state to the low bits
+    of the next() calls made after advances[i] advances of it
+
+    Only the low bit of a rand is linear as next() adds the state words"""
+    rows = np.empty((advances.shape[0], 2), dtype=np.uint64)
+    for i, states in enumerate(
+        basis_evolutions(advances, step_states, JUMP_MATRICES, JUMP_THRESHOLD)
+    ):
+        rows[i] = pack_bits((states[:, 0] ^ states[:, 1]) & np.uint64(1))
+    return rows
+
+
+def from_low_bits(
+    bits: np.ndarray, advances: Optional[np.ndarray] = None, max_states: int = 0x10000
+) -> np.ndarray:
+    """Every Xoroshiro128+ state whose next() calls at advances (default consecutive)
+    have the low bits bits as a (count, 2) array, positioned to return the first
+
+    next_rand(maximum) shares the low bit of next() when maximum is a power of 2
+    or when no rand was rejected.
+    Fewer than 128 independent bits leave 2^(128 - rank) states,
+    which must not exceed max_states"""
+    bits, advances = observed_bits(bits, advances)
+    solution, nullspace, consistent = solve_rows(low_bit_rows(advances), bits)
+    if not consistent:
+        return np.empty((0, 2), dtype=np.uint64)
+    assert (
+        1 << nullspace.shape[0] <= max_states
+    ), f"{1 << nullspace.shape[0]} states fit the bits, more than {max_states}"
+    return enumerate_solutions(solution, nullspace)
+
+
+Xoroshiro128PlusRejection.from_low_bits = from_low_bits
+SplitMixXoroshiro128Plus.from_state = from_state
+SplitMixXoroshiro128Plus.from_states = from_states
@@ -2,10 +2,81 @@
 
 from __future__ import annotations
 import numpy as np
-from ..compilation import optional_jitclass, array_type
+from ..compilation import optional_jitclass, optional_njit, optional_prange, array_type
+from ..gf2 import basis_states, matrix_powers, apply_matrix_words
+
+# advances past which jumping is cheaper than stepping one at a time
+JUMP_THRESHOLD = 0x1000
+
+
+def step_states(states: np.ndarray) -> np.ndarray:
+    """Advance a (count, 4) uint32 array of states by 1 in place"""
+    t_val = states[:, 0].copy()
+    s_val = states[:, 3].copy()
+
+    t_val ^= t_val << np.uint32(11)
+    t_val ^= t_val >> np.uint32(8)
+    t_val ^= s_val ^ (s_val >> np.uint32(19))
+
+    states[:, :3] = states[:, 1:].copy()
+    states[:, 3] = t_val
+    return states
+
+
+def step_matrix() -> np.ndarray:
+    """Columns of the GF(2) matrix of one state transition,
+    packing state[0] | state[1] << 32 and state[2] | state[3] << 32"""
+    return step_states(basis_states().view(np.uint32)).view(np.uint64)
+
+
+# step^(2^k) for every bit of a 64-bit advance
+JUMP_MATRICES = matrix_powers(step_matrix(), 64)
+
+
+@optional_njit()
+def jump_words(
+    word_0: np.uint64, word_1: np.uint64, adv: np.uint64
+) -> tuple[np.uint64, np.uint64]:
+    """Jump ahead the packed state (word_0, word_1) by adv"""
+    adv = np.uint64(adv)
+    for k in range(64):
+        if (adv >> np.uint64(k)) & np.uint64(1):
+            word_0, word_1 = apply_matrix_words(JUMP_MATRICES[k], word_0, word_1)
+    return word_0, word_1
+
+
+@optional_njit()
+def jump_state(state: np.ndarray, adv: np.uint64) -> None:
+    """Jump ahead a 4 word uint32 state by adv in place"""
+    word_0, word_1 = jump_words(
+        np.uint64(state[0]) | (np.uint64(state[1]) << np.uint64(32)),
+        np.uint64(state[2]) | (np.uint64(state[3]) << np.uint64(32)),
+        adv,
+    )
+    state[0] = np.uint32(word_0 & np.uint64(0xFFFFFFFF))
+    state[1] = np.uint32(word_0 >> np.uint64(32))
+    state[2] = np.uint32(word_1 & np.uint64(0xFFFFFFFF))
+    state[3] = np.uint32(word_1 >> np.uint64(32))
+
+
+@optional_njit(parallel=True)
+def jump_array(states: np.ndarray, adv: np.uint64) -> np.ndarray:
+    """Jump ahead every state of a (count, 4) uint32 array by adv in place
+    and return it"""
+    for i in optional_prange(states.shape[0]):
+        jump_state(states[i], adv)
+    return states
+
+
+@optional_njit(parallel=True)
+def jump_array_lanes(states: np.ndarray, advs: np.ndarray) -> np.ndarray:
+    """Jump ahead each state of a (count, 4) uint32 array by the matching advs value
+    in place and return it"""
+    for i in optional_prange(states.shape[0]):
+        jump_state(states[i], advs[i])
+    return states
 
 
-# TODO: jump tables
 # TODO: staticmethod const functions
 @optional_jitclass
 class Xorshift128:
@@ -32,9 +103,16 @@ class Xorshift128:
 
     def advance(self, adv: np.uint32) -> None:
         """Advance Xorshift128 sequence by adv"""
+        if adv >= JUMP_THRESHOLD:
+            self.jump(adv)
+            return
         for _ in range(adv):
             self.next()
 
+    def jump(self, adv: np.uint64) -> None:
+        """Jump ahead by adv via precomputed GF(2) matrix powers"""
+        jump_state(self.state, adv)
+
     def next(self) -> np.uint32:
         """Advance and return the next 32-bit rand"""
         t_val = np.uint32(self.state[0])
@@ -88,6 +166,18 @@ class Xorshift128:
 
         return self.next() % maximum
 
+    def fill(self, out: np.ndarray) -> np.ndarray:
+        """Fill out with the next out.shape[0] 32-bit rands"""
+        for i in range(out.shape[0]):
+            out[i] = self.next()
+        return out
+
+    def fill_rand(self, out: np.ndarray, maximum: np.uint32) -> np.ndarray:
+        """Fill out with the next out.shape[0] [0, maximum) random uints"""
+        for i in range(out.shape[0]):
+            out[i] = self.next_rand(maximum)
+        return out
+
     def next_alternate_rand(self, maximum: np.uint32) -> np.uint32:
         """Generate and return the next [0, maximum) random uint
         via next_randrange(-0x80000000, 0x7FFFFFFF) % maximum"""
@@ -110,3 +200,7 @@ class Xorshift128:
         )
 
         return rand_float * minimum + (1 - rand_float) * maximum
+
+
+Xorshift128.jump_array = jump_array
+Xorshift128.jump_array_lanes = jump_array_lanes
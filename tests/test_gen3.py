@@ -0,0 +1,27 @@
+"""Tests for Gen 3 generators"""
+import pytest
+from numba_pokemon_prngs.options import USE_NUMBA
+from numba_pokemon_prngs.enums import Encounter, Game, Lead, Method
+
+try:
+    # importing any encounter module also loads the LA spawner data
+    from numba_pokemon_prngs.data.encounter import ENCOUNTER_INFORMATION_GEN3
+    from numba_pokemon_prngs.gen3.wild_generator_3 import WildGenerator3
+except FileNotFoundError as error:
+    pytest.skip(f"encounter resources are missing: {error}", allow_module_level=True)
+
+
+@pytest.mark.skipif(not USE_NUMBA, reason="gen3 helpers are only njit compiled")
+def test_wild_rock_smash():
+    """Test that failed RSE rock smash checks still advance the main rng"""
+    # Granite Cave B2F
+    encounter_area = ENCOUNTER_INFORMATION_GEN3[Game.RUBY][13]
+    generator = WildGenerator3(
+        Method.METHOD_1, Encounter.ROCK_SMASH, Lead.NONE, Game.RUBY, 12345, 54321
+    )
+    states = generator.generate(0x1234, 0, 0, 200, encounter_area)
+    # only about 1 in 9 advances passes the rock smash check
+    assert 0 < len(states) < 200
+    for state in states:
+        (expected,) = generator.generate(0x1234, 0, state.advance, 1, encounter_area)
+        assert (state.advance, state.pid) == (expected.advance, expected.pid)
@@ -1,4 +1,7 @@
 """Tests for LCRNG classes"""
+import numpy as np
+from numba_pokemon_prngs.compilation import optional_njit
+from numba_pokemon_prngs.enums import Method
 from numba_pokemon_prngs.lcrng import (
     PokeRNGDiv,
     PokeRNGMod,
@@ -10,6 +13,8 @@ from numba_pokemon_prngs.lcrng import (
     XDRNGR,
     BWRNG,
     BWRNGR,
+    recover_iv_seeds,
+    sweep_lcrng32,
 )
 
 
@@ -698,3 +703,168 @@ def test_lcrng64_jump():
             6898835439005849164,
         ),
     )
+
+
+def test_lcrng32_array():
+    """Test LCRNG32 array kernels against scalar calls"""
+    seeds = np.array(
+        (0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE, 0, 0xFFFFFFFF), np.uint32
+    )
+    advs = np.array((0, 1, 12, 1234, 123456, 1234567890), np.uint32)
+    for lcrng_class in (PokeRNGDiv, PokeRNGMod, PokeRNGRMod, XDRNG, XDRNGR):
+        test_seeds = seeds.copy()
+        assert tuple(lcrng_class.next_array(test_seeds)) == tuple(
+            lcrng_class(seed).next() for seed in seeds
+        )
+        test_seeds = seeds.copy()
+        assert tuple(lcrng_class.next_u16_array(test_seeds)) == tuple(
+            lcrng_class(seed).next_u16() for seed in seeds
+        )
+        test_seeds = seeds.copy()
+        assert tuple(lcrng_class.next_rand_array(test_seeds, 25)) == tuple(
+            lcrng_class(seed).next_rand(25) for seed in seeds
+        )
+        test_seeds = seeds.copy()
+        assert tuple(lcrng_class.jump_array(test_seeds, 12345)) == tuple(
+            lcrng_class(seed).jump(12345) for seed in seeds
+        )
+        test_seeds = seeds.copy()
+        assert tuple(lcrng_class.jump_array_lanes(test_seeds, advs)) == tuple(
+            lcrng_class(seed).jump(adv) for seed, adv in zip(seeds, advs)
+        )
+
+
+def test_lcrng_distance():
+    """Test LCRNG distance() calls against jump()"""
+    advs = (0, 1, 12, 123, 1234567, 0xDEADBEEF, 0xFFFFFFFF)
+    for lcrng_class in (PokeRNGMod, PokeRNGRMod, ARNG, ARNGR, XDRNG, XDRNGR):
+        targets = np.array(
+            tuple(lcrng_class(0x12345678).jump(adv) for adv in advs), np.uint32
+        )
+        assert (
+            tuple(lcrng_class.distance(0x12345678, target) for target in targets)
+            == advs
+        )
+        assert tuple(lcrng_class.distance_array(0x12345678, targets)) == advs
+    advs = (0, 1, 12, 123, 1234567, 0xDEADBEEF, 0x3EADBEEFCAFEBABE)
+    for lcrng_class in (BWRNG, BWRNGR):
+        targets = np.array(
+            tuple(lcrng_class(0x1234567887654321).jump(adv) for adv in advs),
+            np.uint64,
+        )
+        assert (
+            tuple(
+                lcrng_class.distance(0x1234567887654321, target) for target in targets
+            )
+            == advs
+        )
+        # python ints above 2**63 are typed as uint64
+        assert (
+            tuple(
+                lcrng_class.distance(
+                    0xFEDCBA9876543210,
+                    int(lcrng_class(np.uint64(0xFEDCBA9876543210)).jump(adv)),
+                )
+                for adv in advs
+            )
+            == advs
+        )
+        assert (
+            tuple(lcrng_class.distance_array(np.uint64(0x1234567887654321), targets))
+            == advs
+        )
+
+
+def test_lcrng_const_function_memoization():
+    """Test const_rand()/const_jump() return shared compiled functions"""
+    assert PokeRNGMod.const_rand(100) is PokeRNGMod.const_rand(100)
+    assert PokeRNGMod.const_rand(100) is not PokeRNGMod.const_rand(25)
+    assert PokeRNGMod.const_rand(100) is not PokeRNGDiv.const_rand(100)
+    assert PokeRNGMod.const_jump(1234) is PokeRNGMod.const_jump(1234)
+    assert BWRNG.const_rand(25) is BWRNG.const_rand(25)
+    assert BWRNG.const_jump(1234) is not BWRNGR.const_jump(1234)
+
+    rand_100 = PokeRNGMod.const_rand(100)
+    test_pokerng_mod = PokeRNGMod(0x12345678)
+    reference_pokerng_mod = PokeRNGMod(0x12345678)
+    assert tuple(rand_100(test_pokerng_mod) for _ in range(5)) == tuple(
+        reference_pokerng_mod.next_rand(100) for _ in range(5)
+    )
+
+
+def test_lcrng32_iv_seed_recovery():
+    """Test recover_iv_seeds() calls for IVs generated from 0x12345678"""
+    assert tuple(
+        tuple(sorted(recover_iv_seeds(ivs, method)))
+        for ivs, method in (
+            ((10, 12, 22, 7, 29, 0), Method.METHOD_1),
+            ((0, 7, 29, 20, 9, 4), Method.METHOD_2),
+            ((10, 12, 22, 20, 9, 4), Method.METHOD_4),
+            ((9, 31, 12, 25, 22, 31), Method.XD_COLO),
+        )
+    ) == (
+        (37701012, 305419896, 1573897695, 2185184660, 2452903544, 3721381343),
+        (305419896, 1211026703, 2452903544, 3358510351),
+        (305419896, 447027059, 2452903544, 2594510707),
+        (7489691, 305419896, 603350101, 2154973339, 2452903544, 2750833749),
+    )
+
+
+@optional_njit()
+def low_byte_predicate(seed: np.uint32) -> bool:
+    """Test predicate for sweep_lcrng32()"""
+    return (seed & np.uint32(0xFF)) == np.uint32(0x7F)
+
+
+def test_lcrng32_sweep():
+    """Test sweep_lcrng32() calls against a sequential search"""
+    test_pokerng_mod = PokeRNGMod(0x12345678)
+    expected = []
+    seed = 0x12345678
+    for _ in range(100000):
+        if seed & 0xFF == 0x7F:
+            expected.append(seed)
+        seed = test_pokerng_mod.next()
+
+    progress = []
+    assert tuple(
+        sweep_lcrng32(
+            PokeRNGMod,
+            low_byte_predicate,
+            initial_seed=0x12345678,
+            count=100000,
+            chunk_size=1000,
+            chunks_per_batch=16,
+            buffer_size=2,
+            progress=lambda done, count: progress.append(done),
+        )
+    ) == tuple(expected)
+    assert tuple(progress) == (16000, 32000, 48000, 64000, 80000, 96000, 100000)
+
+
+def test_lcrng_fill():
+    """Test LCRNG fill() calls against sequential calls"""
+    for lcrng_class in (PokeRNGDiv, PokeRNGMod, PokeRNGRMod, XDRNGR):
+        test_lcrng = lcrng_class(0x12345678)
+        reference_lcrng = lcrng_class(0x12345678)
+        assert tuple(test_lcrng.fill(np.empty(10, np.uint32))) == tuple(
+            reference_lcrng.next() for _ in range(10)
+        )
+        assert tuple(test_lcrng.fill_u16(np.empty(10, np.uint16))) == tuple(
+            reference_lcrng.next_u16() for _ in range(10)
+        )
+        assert tuple(test_lcrng.fill_rand(np.empty(10, np.uint16), 25)) == tuple(
+            reference_lcrng.next_rand(25) for _ in range(10)
+        )
+    for lcrng_class in (BWRNG, BWRNGR):
+        test_lcrng = lcrng_class(0x1234567887654321)
+        reference_lcrng = lcrng_class(0x1234567887654321)
+        assert tuple(test_lcrng.fill(np.empty(10, np.uint64))) == tuple(
+            reference_lcrng.next() for _ in range(10)
+        )
+        assert tuple(test_lcrng.fill_u32(np.empty(10, np.uint32))) == tuple(
+            reference_lcrng.next_u32() for _ in range(10)
+        )
+        assert tuple(test_lcrng.fill_rand(np.empty(10, np.uint32), 25)) == tuple(
+            reference_lcrng.next_rand(25) for _ in range(10)
+        )
@@ -1,10 +1,18 @@
 """Tests for Mersenne Twister classes"""
 from hashlib import sha256
+import numpy as np
+import pytest
 from numba_pokemon_prngs.mersenne_twister import (
     MersenneTwister,
+    MersenneTwisterBatch,
     SIMDFastMersenneTwister,
     TinyMersenneTwister,
+    TinyMersenneTwisterBatch,
+    search_sfmt_seeds,
 )
+from numba_pokemon_prngs.mersenne_twister import mt, sfmt, tinymt
+from numba_pokemon_prngs.mersenne_twister.polynomial import minimal_polynomial
+from numba_pokemon_prngs.mersenne_twister.mt import temper, untemper
 
 
 def test_init():
@@ -177,3 +185,230 @@ def test_next_rand():
         (76, 76, 89, 3, 13),
         (206, 170, 162, 66, 85),
     )
+
+
+def test_fill():
+    """Test fill() functions against sequential calls"""
+    for mt_class in (MersenneTwister, TinyMersenneTwister):
+        test_mt = mt_class(0x12345678)
+        reference_mt = mt_class(0x12345678)
+        # crosses a full shuffle for MersenneTwister
+        assert tuple(test_mt.fill(np.empty(700, np.uint32))) == tuple(
+            reference_mt.next() for _ in range(700)
+        )
+        assert tuple(test_mt.fill_rand(np.empty(10, np.uint32), 25)) == tuple(
+            reference_mt.next_rand(25) for _ in range(10)
+        )
+        assert tuple(test_mt.fill_rand_mod(np.empty(10, np.uint32), 25)) == tuple(
+            reference_mt.next_rand_mod(25) for _ in range(10)
+        )
+
+    test_sfmt = SIMDFastMersenneTwister(0x12345678)
+    reference_sfmt = SIMDFastMersenneTwister(0x12345678)
+    assert tuple(test_sfmt.fill(np.empty(400, np.uint64))) == tuple(
+        reference_sfmt.next() for _ in range(400)
+    )
+    assert tuple(test_sfmt.fill_rand(np.empty(10, np.uint64), 25)) == tuple(
+        reference_sfmt.next_rand(25) for _ in range(10)
+    )
+
+
+def test_jump():
+    """Test jump() calls with jump polynomials against linear advance() calls"""
+    assert np.array_equal(mt.JUMP_POLYNOMIALS, mt.jump_polynomials())
+    for initial_advance, adv in (
+        (0, 0),
+        (0, 1000),
+        (1, 623),
+        (624, 1),
+        (700, 123456),
+        (3, (3 << mt.JUMP_BITS) + 12345),
+    ):
+        test_mt = MersenneTwister(0x12345678)
+        reference_mt = MersenneTwister(0x12345678)
+        test_mt.advance(initial_advance)
+        reference_mt.advance(initial_advance)
+        # stay below JUMP_THRESHOLD so the reference shuffles one at a time
+        for _ in range(adv >> (mt.JUMP_BITS - 1)):
+            reference_mt.advance(1 << (mt.JUMP_BITS - 1))
+        reference_mt.advance(adv & ((1 << (mt.JUMP_BITS - 1)) - 1))
+        test_mt.jump(adv)
+        assert tuple(test_mt.next() for _ in range(700)) == tuple(
+            reference_mt.next() for _ in range(700)
+        )
+    test_mt = MersenneTwister(0x12345678)
+    reference_mt = MersenneTwister(0x12345678)
+    test_mt.advance(mt.JUMP_THRESHOLD + 1)
+    reference_mt.jump(mt.JUMP_THRESHOLD + 1)
+    assert test_mt.next() == reference_mt.next()
+
+    assert np.array_equal(sfmt.JUMP_POLYNOMIALS, sfmt.jump_polynomials())
+    for initial_advance, adv in (
+        (0, 0),
+        (0, 1001),
+        (1, 311),
+        (312, 1),
+        (401, 123457),
+        (1, (3 << sfmt.JUMP_BITS) + 12345),
+    ):
+        test_sfmt = SIMDFastMersenneTwister(0x12345678)
+        reference_sfmt = SIMDFastMersenneTwister(0x12345678)
+        test_sfmt.advance(initial_advance)
+        reference_sfmt.advance(initial_advance)
+        # stay below JUMP_THRESHOLD so the reference shuffles one at a time
+        for _ in range(adv >> (sfmt.JUMP_BITS - 1)):
+            reference_sfmt.advance(1 << (sfmt.JUMP_BITS - 1))
+        reference_sfmt.advance(adv & ((1 << (sfmt.JUMP_BITS - 1)) - 1))
+        test_sfmt.jump(adv)
+        assert tuple(test_sfmt.next() for _ in range(400)) == tuple(
+            reference_sfmt.next() for _ in range(400)
+        )
+    test_sfmt = SIMDFastMersenneTwister(0x12345678)
+    reference_sfmt = SIMDFastMersenneTwister(0x12345678)
+    test_sfmt.advance(sfmt.JUMP_THRESHOLD + 1)
+    reference_sfmt.jump(sfmt.JUMP_THRESHOLD + 1)
+    assert test_sfmt.next() == reference_sfmt.next()
+
+    for adv in (0, 1, 127, 1000, 123456):
+        test_tinymt = TinyMersenneTwister(0x12345678)
+        reference_tinymt = TinyMersenneTwister(0x12345678)
+        for _ in range(adv):
+            reference_tinymt.shuffle()
+        test_tinymt.jump(adv)
+        assert tuple(test_tinymt.next() for _ in range(10)) == tuple(
+            reference_tinymt.next() for _ in range(10)
+        )
+
+    test_tinymt = TinyMersenneTwister(0x12345678)
+    state_bits = []
+    for _ in range(254):
+        test_tinymt.shuffle()
+        state_bits.append(int(test_tinymt.state[3]) & 1)
+    assert minimal_polynomial(state_bits) == (
+        int(tinymt.CHARACTERISTIC_POLYNOMIAL_HIGH) << 64
+    ) | int(tinymt.CHARACTERISTIC_POLYNOMIAL_LOW)
+
+
+def test_prefix():
+    """Test prefix() calls against the first rands of a fully initialized state"""
+    for seed in (0x12345678, 0xDEADBEEF):
+        test_mt = MersenneTwister(seed)
+        expected = tuple(test_mt.next() for _ in range(227))
+        for count in (0, 1, 6, 227):
+            assert tuple(MersenneTwister.prefix(seed, count)) == expected[:count]
+
+
+def test_batch():
+    """Test batch lanes against individual Mersenne Twister objects"""
+    seeds = np.array((0x12345678, 0xDEADBEEF, 0x88776655, 0xCAFEBEEF), dtype=np.uint32)
+    test_batch_mt = MersenneTwisterBatch(seeds)
+    reference_mts = tuple(MersenneTwister(seed) for seed in seeds)
+    test_batch_mt.advance(5)
+    for reference_mt in reference_mts:
+        reference_mt.advance(5)
+    for _ in range(700):
+        assert tuple(test_batch_mt.next()) == tuple(
+            reference_mt.next() for reference_mt in reference_mts
+        )
+    assert tuple(test_batch_mt.next_rand(25)) == tuple(
+        reference_mt.next_rand(25) for reference_mt in reference_mts
+    )
+    assert tuple(test_batch_mt.next_rand_mod(25)) == tuple(
+        reference_mt.next_rand_mod(25) for reference_mt in reference_mts
+    )
+    rands = test_batch_mt.fill(np.empty((3, seeds.shape[0]), dtype=np.uint32))
+    assert tuple(map(tuple, rands.T)) == tuple(
+        tuple(reference_mt.next() for _ in range(3)) for reference_mt in reference_mts
+    )
+
+    # seed 0 checks the all zero state fallback is not triggered spuriously
+    seeds = np.array((0, 0x12345678, 0xDEADBEEF, 0xFFFFFFFF), dtype=np.uint32)
+    test_batch_tinymt = TinyMersenneTwisterBatch(seeds)
+    reference_tinymts = tuple(TinyMersenneTwister(seed) for seed in seeds)
+    for adv in (5, 0x4000):
+        test_batch_tinymt.advance(adv)
+        for reference_tinymt in reference_tinymts:
+            reference_tinymt.advance(adv)
+        for _ in range(100):
+            assert tuple(test_batch_tinymt.next()) == tuple(
+                reference_tinymt.next() for reference_tinymt in reference_tinymts
+            )
+    assert tuple(test_batch_tinymt.next_rand(25)) == tuple(
+        reference_tinymt.next_rand(25) for reference_tinymt in reference_tinymts
+    )
+    assert tuple(test_batch_tinymt.next_rand_mod(25)) == tuple(
+        reference_tinymt.next_rand_mod(25) for reference_tinymt in reference_tinymts
+    )
+    rands = test_batch_tinymt.fill(np.empty((3, seeds.shape[0]), dtype=np.uint32))
+    assert tuple(map(tuple, rands.T)) == tuple(
+        tuple(reference_tinymt.next() for _ in range(3))
+        for reference_tinymt in reference_tinymts
+    )
+
+
+def test_reverse():
+    """Test untemper(), previous() calls and state/seed recovery from outputs"""
+    for y_rand in (0, 0xFFFFFFFF, 0x12345678, 0xDEADBEEF):
+        assert untemper(temper(y_rand)) == y_rand
+
+    test_mt = MersenneTwister(0x12345678)
+    rands = tuple(test_mt.next() for _ in range(2000))
+    assert tuple(test_mt.previous() for _ in range(2000)) == rands[::-1]
+    # no rand precedes the first after re_init
+    with pytest.raises(AssertionError):
+        test_mt.previous()
+    assert test_mt.next() == rands[0]
+    test_mt.re_init(0x12345678)
+    with pytest.raises(AssertionError):
+        test_mt.previous()
+    assert test_mt.next() == rands[0]
+
+    recovered_mt = MersenneTwister.from_outputs(np.array(rands[100:724], np.uint32))
+    assert tuple(recovered_mt.next() for _ in range(100)) == rands[724:824]
+
+    recovered_mt = MersenneTwister.from_outputs(np.array(rands[:624], np.uint32))
+    recovered_mt.unshuffle()
+    # the low bits of the seed word never reach the outputs
+    assert tuple(recovered_mt.state[1:]) == tuple(MersenneTwister(0x12345678).state[1:])
+    assert MersenneTwister.recover_seed(recovered_mt.state[400], 400) == 0x12345678
+
+    test_tinymt = TinyMersenneTwister(0x12345678)
+    test_tinymt.advance(50)
+    rands = np.array(tuple(test_tinymt.next() for _ in range(1000)), np.uint32)
+    recovered_tinymt = TinyMersenneTwister.from_low_bits(rands[:200] & 1)
+    assert tuple(recovered_tinymt.next() for _ in range(1000)) == tuple(rands)
+    assert TinyMersenneTwister.recover_seed(rands[:200] & 1, None, 50) == 0x12345678
+    advances = np.arange(0, 1000, 5)
+    assert (
+        TinyMersenneTwister.recover_seed(rands[advances] & 1, advances, 50)
+        == 0x12345678
+    )
+    rands[150] ^= 1
+    assert TinyMersenneTwister.recover_seed(rands[:200] & 1, None, 50) is None
+
+
+def test_sfmt_search():
+    """Test search_sfmt_seeds() against SIMDFastMersenneTwister next_rand() calls"""
+
+    def clock_needles(seed, initial_advances, count):
+        test_sfmt = SIMDFastMersenneTwister(seed)
+        test_sfmt.advance(initial_advances)
+        return tuple(test_sfmt.next_rand(17) for _ in range(count))
+
+    for initial_advances, count in ((0, 8), (5, 3), (60, 8)):
+        needles = clock_needles(0xDEADBEEF, initial_advances, count)
+        seeds = search_sfmt_seeds(
+            needles,
+            17,
+            initial_advances=initial_advances,
+            seed_start=0xDEADBEEF - 200,
+            seed_count=400,
+            chunk_size=64,
+            buffer_size=1,
+        )
+        assert 0xDEADBEEF in seeds
+        assert tuple(
+            seed
+            for seed in range(0xDEADBEEF - 200, 0xDEADBEEF + 200)
+            if clock_needles(seed, initial_advances, count) == needles
+        ) == tuple(sorted(seeds))
@@ -0,0 +1,99 @@
+"""Tests for RNGList classes"""
+import numpy as np
+from numba_pokemon_prngs.lcrng import PokeRNGMod, BWRNG
+from numba_pokemon_prngs.mersenne_twister import MersenneTwister
+from numba_pokemon_prngs.xorshift import Xoroshiro128PlusRejection
+from numba_pokemon_prngs.rng_list import build_rnglist
+
+PokeRNGModU16List = build_rnglist(
+    rng_class=PokeRNGMod, next_function_name="next_u16", state_type=np.uint16, size=8
+)
+BWRNGList = build_rnglist(
+    rng_class=BWRNG, next_function_name="next", state_type=np.uint64, size=8
+)
+MersenneTwisterRandList = build_rnglist(
+    rng_class=MersenneTwister,
+    next_function_name="next_rand",
+    state_type=np.uint32,
+    size=16,
+    next_function_args=(25,),
+)
+PokeRNGModJumpList = build_rnglist(
+    rng_class=PokeRNGMod,
+    next_function_name="next_rand",
+    state_type=np.uint16,
+    size=8,
+    next_function_args=(100,),
+    jump_function_name="jump",
+)
+MersenneTwisterJumpList = build_rnglist(
+    rng_class=MersenneTwister,
+    next_function_name="next",
+    state_type=np.uint32,
+    size=8,
+    jump_function_name="advance",
+)
+Xoroshiro128PlusRejectionList = build_rnglist(
+    rng_class=Xoroshiro128PlusRejection,
+    next_function_name="next",
+    state_type=np.uint64,
+    size=4,
+)
+
+
+def test_rnglist_outputs():
+    """Test RNGList get_value() calls for various output functions/types"""
+    for rng_list, reference_rng, next_function in (
+        (
+            PokeRNGModU16List(PokeRNGMod(0x12345678)),
+            PokeRNGMod(0x12345678),
+            lambda rng: rng.next_u16(),
+        ),
+        (
+            BWRNGList(BWRNG(0x1234567887654321)),
+            BWRNG(0x1234567887654321),
+            lambda rng: rng.next(),
+        ),
+        (
+            MersenneTwisterRandList(MersenneTwister(0x12345678)),
+            MersenneTwister(0x12345678),
+            lambda rng: rng.next_rand(25),
+        ),
+        (
+            Xoroshiro128PlusRejectionList(Xoroshiro128PlusRejection(0x12345678)),
+            Xoroshiro128PlusRejection(0x12345678),
+            lambda rng: rng.next(),
+        ),
+    ):
+        expected = tuple(next_function(reference_rng) for _ in range(100))
+        values = []
+        for advance in range(90):
+            rng_list.advance_states(1 if advance else 0)
+            values.append(rng_list.get_value())
+        assert tuple(values) == expected[:90]
+        # jumping past the list size refills it as a block
+        rng_list.advance_states(5)
+        assert tuple(rng_list.get_value() for _ in range(4)) == expected[94:98]
+
+
+def test_rnglist_jump():
+    """Test RNGList advance_states() calls past the list size using jump functions"""
+    for rng_list, reference_rng, next_function in (
+        (
+            PokeRNGModJumpList(PokeRNGMod(0x12345678)),
+            PokeRNGMod(0x12345678),
+            lambda rng: rng.next_rand(100),
+        ),
+        (
+            MersenneTwisterJumpList(MersenneTwister(0x12345678)),
+            MersenneTwister(0x12345678),
+            lambda rng: rng.next(),
+        ),
+    ):
+        expected = tuple(next_function(reference_rng) for _ in range(3000))
+        rng_list.advance_states(3)
+        assert tuple(rng_list.get_value() for _ in range(8)) == expected[3:11]
+        rng_list.advance_states(2000)
+        assert tuple(rng_list.get_value() for _ in range(8)) == expected[2003:2011]
+        rng_list.advance_states(1)
+        assert tuple(rng_list.get_value() for _ in range(8)) == expected[2004:2012]
@@ -1,9 +1,17 @@
 """Tests for Xorshift classes"""
+import numpy as np
 from numba_pokemon_prngs.xorshift import (
     Xorshift128,
     Xoroshiro128PlusRejection,
     SplitMixXoroshiro128Plus,
 )
+from numba_pokemon_prngs import gf2
+from numba_pokemon_prngs.xorshift import xoroshiro128plus
+from numba_pokemon_prngs.xorshift import (
+    recover_from_blinks,
+    verify_blinks,
+    reidentify_blinks,
+)
 
 
 def test_init():
@@ -194,3 +202,190 @@ def test_next_rand():
         (71, 41, 5, 57, 59),
         (217, 128, 23, 79, 63),
     )
+
+
+def test_fill():
+    """Test fill() functions against sequential calls"""
+    for test_rng, reference_rng, dtype in (
+        (
+            Xorshift128(0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE),
+            Xorshift128(0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE),
+            np.uint32,
+        ),
+        (
+            SplitMixXoroshiro128Plus(0x12345678),
+            SplitMixXoroshiro128Plus(0x12345678),
+            np.uint32,
+        ),
+        (
+            Xoroshiro128PlusRejection(0x12345678),
+            Xoroshiro128PlusRejection(0x12345678),
+            np.uint64,
+        ),
+    ):
+        assert tuple(test_rng.fill(np.empty(10, dtype))) == tuple(
+            reference_rng.next() for _ in range(10)
+        )
+        assert tuple(test_rng.fill_rand(np.empty(10, np.uint32), 25)) == tuple(
+            reference_rng.next_rand(25) for _ in range(10)
+        )
+
+
+def test_jump():
+    """Test jump functions against sequential next() calls and matrix powers"""
+    long_jump_matrix = gf2.matrix_powers(xoroshiro128plus.step_matrix(), 97)[96]
+    for rng_class in (Xoroshiro128PlusRejection, SplitMixXoroshiro128Plus):
+        for adv in (0, 1, 1000, 12345):
+            test_rng = rng_class(0x12345678)
+            advance_rng = rng_class(0x12345678)
+            reference_rng = rng_class(0x12345678)
+            test_rng.jump(adv)
+            advance_rng.advance(adv)
+            for _ in range(adv):
+                reference_rng.next()
+            assert tuple(test_rng.state) == tuple(reference_rng.state)
+            assert tuple(advance_rng.state) == tuple(reference_rng.state)
+
+        test_rng = rng_class(0x12345678)
+        reference_rng = rng_class(0x12345678)
+        test_rng.jump_2_64()
+        reference_rng.jump(np.uint64(1 << 63))
+        reference_rng.jump(np.uint64(1 << 63))
+        assert tuple(test_rng.state) == tuple(reference_rng.state)
+
+        test_rng = rng_class(0x12345678)
+        reference_state = test_rng.state.copy()
+        test_rng.jump_2_96()
+        gf2.apply_matrix(long_jump_matrix, reference_state)
+        assert tuple(test_rng.state) == tuple(reference_state)
+
+
+def test_recover():
+    """Test state recovery from low bits and rewinding to the seed"""
+    test_rng = Xoroshiro128PlusRejection(0xDEADBEEFCAFE)
+    test_rng.advance(30)
+    state = tuple(test_rng.state)
+    bits = np.array(tuple(test_rng.next_rand(2) for _ in range(2000)), np.uint8)
+
+    assert tuple(map(tuple, Xoroshiro128PlusRejection.from_low_bits(bits[:140]))) == (
+        state,
+    )
+    states = Xoroshiro128PlusRejection.from_low_bits(bits[:120])
+    # 8 missing bits of rank leave 256 candidate states
+    assert states.shape[0] == 256 and state in tuple(map(tuple, states))
+    advances = np.arange(0, 2000, 13)
+    assert tuple(
+        map(tuple, Xoroshiro128PlusRejection.from_low_bits(bits[advances], advances))
+    ) == (state,)
+    bits[130] ^= 1
+    assert Xoroshiro128PlusRejection.from_low_bits(bits[:140]).shape[0] == 0
+
+    test_rng.state[:] = state
+    assert test_rng.rewind_to_seed(10) == -1
+    assert tuple(test_rng.state) == state
+    assert test_rng.rewind_to_seed(100) == 30
+    assert test_rng.state[0] == 0xDEADBEEFCAFE
+
+
+def test_xorshift128_jump():
+    """Test Xorshift128 jump functions against sequential next() calls"""
+    states = np.array(
+        ((1, 2, 3, 4), (0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE)), np.uint32
+    )
+    for adv in (0, 1, 1000, 12345):
+        reference_rngs = tuple(Xorshift128(*state) for state in states)
+        for reference_rng in reference_rngs:
+            for _ in range(adv):
+                reference_rng.next()
+        test_rng = Xorshift128(*states[1])
+        advance_rng = Xorshift128(*states[1])
+        test_rng.jump(adv)
+        advance_rng.advance(adv)
+        assert tuple(test_rng.state) == tuple(reference_rngs[1].state)
+        assert tuple(advance_rng.state) == tuple(reference_rngs[1].state)
+        assert tuple(map(tuple, Xorshift128.jump_array(states.copy(), adv))) == tuple(
+            tuple(reference_rng.state) for reference_rng in reference_rngs
+        )
+
+    advs = np.array((0, 12345), np.uint64)
+    reference_rngs = tuple(Xorshift128(*state) for state in states)
+    reference_rngs[1].advance(12345)
+    assert tuple(
+        map(tuple, Xorshift128.jump_array_lanes(states.copy(), advs))
+    ) == tuple(tuple(reference_rng.state) for reference_rng in reference_rngs)
+
+
+def test_player_blink():
+    """Test state recovery and reidentification from player blink intervals"""
+    test_rng = Xorshift128(0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE)
+    rands = test_rng.fill(np.empty(20000, np.uint32))
+    blinks = np.flatnonzero((rands & 0xF) == 0)
+    intervals = np.diff(blinks[:40]).astype(np.uint64)
+    test_rng = Xorshift128(0x12345678, 0x87654321, 0xDEADBEEF, 0xBEEFCAFE)
+    test_rng.advance(blinks[0])
+    state = tuple(test_rng.state)
+
+    assert tuple(map(tuple, recover_from_blinks(intervals))) == (state,)
+    # 120 blink bits leave 256 candidates that only the verifier tells apart
+    assert tuple(map(tuple, recover_from_blinks(intervals[:29]))) == (state,)
+    assert verify_blinks(test_rng.state, intervals, 0xF)
+    assert not verify_blinks(test_rng.state, intervals + np.uint64(1), 0xF)
+    # plain sequences are accepted like recover_from_blinks accepts them
+    assert verify_blinks(list(state), intervals.tolist())
+
+    later_intervals = np.diff(blinks[500:508]).astype(np.uint64)
+    assert tuple(reidentify_blinks(test_rng.state, later_intervals, 10000)) == (
+        blinks[500] - blinks[0],
+    )
+    assert tuple(reidentify_blinks(state, later_intervals.tolist(), 10000)) == (
+        blinks[500] - blinks[0],
+    )
+
+
+def test_const_rand():
+    """Test const_rand() returns shared compiled functions matching next_rand()"""
+    assert Xoroshiro128PlusRejection.const_rand(25) is (
+        Xoroshiro128PlusRejection.const_rand(25)
+    )
+    assert Xoroshiro128PlusRejection.const_rand(25) is not (
+        SplitMixXoroshiro128Plus.const_rand(25)
+    )
+    for rng_class in (Xoroshiro128PlusRejection, SplitMixXoroshiro128Plus):
+        # power of 2 maximums take the path without rejection
+        for maximum in (25, 4096):
+            rand_function = rng_class.const_rand(maximum)
+            test_rng = rng_class(0x12345678)
+            reference_rng = rng_class(0x12345678)
+            assert tuple(rand_function(test_rng) for _ in range(20)) == tuple(
+                reference_rng.next_rand(maximum) for _ in range(20)
+            )
+
+
+def test_splitmix_seed():
+    """Test seed recovery from freshly initialized SplitMixXoroshiro128Plus states"""
+    seeds = (0, 0x12345678, 0xFFFFFFFF, 0xDEADBEEFCAFEBABE)
+    for seed in seeds:
+        assert (
+            SplitMixXoroshiro128Plus.unsplitmix(
+                SplitMixXoroshiro128Plus.splitmix(seed, 0x9E3779B97F4A7C15),
+                0x9E3779B97F4A7C15,
+            )
+            == seed
+        )
+        assert (
+            SplitMixXoroshiro128Plus.from_state(
+                SplitMixXoroshiro128Plus(np.uint64(seed)).state
+            )
+            == seed
+        )
+    test_rng = SplitMixXoroshiro128Plus(0x12345678)
+    test_rng.next()
+    assert SplitMixXoroshiro128Plus.from_state(test_rng.state) is None
+
+    states = np.array(
+        tuple(SplitMixXoroshiro128Plus(np.uint64(seed)).state for seed in seeds)
+        + (test_rng.state,)
+    )
+    recovered_seeds, valid = SplitMixXoroshiro128Plus.from_states(states)
+    assert tuple(recovered_seeds[:4]) == seeds
+    assert tuple(valid) == (True, True, True, True, False)